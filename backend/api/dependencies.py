@@ -0,0 +1,11 @@
+from concurrent.futures import Executor
+import httpx
+from fastapi import Request
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Pooled outbound HTTP client created in the app lifespan"""
+    return request.app.state.http_client
+
+def get_process_pool(request: Request) -> Executor:
+    """Worker process pool for CPU-bound work, created in the app lifespan"""
+    return request.app.state.process_pool
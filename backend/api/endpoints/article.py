@@ -1,33 +1,68 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Response, Depends, Form, File, UploadFile
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Dict, Any, List, Optional
+from concurrent.futures import Executor
+from contextlib import aclosing
+from itertools import chain
+from cachetools import LRUCache, TTLCache
+import httpx
+import uuid
 import asyncio
 import logging
-from pydantic import BaseModel
-from models.schemas import ArticleRequest, ArticleResponse, GenerationContext, ImageSlot, ArticleLayout
-from services.llm_service import LLMService
-from services.web_scraper import WebScraperService
-from services.pdf_processor import PDFProcessorService
-from services.quality_checker import QualityCheckerService
-from services.pdf_generator import PDFGeneratorService
-from services.translation_service import TranslationService
-from utils.helpers import parse_seo_keywords, validate_url
+import threading
+import orjson
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from models.schemas import ArticleRequest, ArticleResponse, ArticleAnalysis, GenerationContext, ArticleLayout, UrlContentInstruction, UrlInstruction, QualityFeedback
+from services.llm_service import LLMService, get_llm_service
+from services.llm_service_gemini import LLMServiceGemini, get_llm_service_gemini
+from services.llm_batcher import get_llm_batcher, get_llm_executor, get_quality_batcher, run_llm_call
+from services.web_scraper import WebScraperService, get_web_scraper
+from services.pdf_processor import PDFProcessorService, get_pdf_processor
+from services.quality_checker import get_quality_checker
+from services.pdf_generator import PDFGeneratorService, get_pdf_generator
+from services.translation_service import TranslationService, get_translation_service
+from utils.helpers import parse_seo_keywords, validate_url, iterate_in_thread, get_token_encoding, JsonStringFieldReader
+from utils.cache import AsyncTTLCache, content_hash
+from api.dependencies import get_http_client, get_process_pool
 from config.settings import settings
 
 router = APIRouter()
 
 # Setup logger
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
-
-# Initialize services
-llm_service = LLMService()
-from services.llm_service_gemini import LLMServiceGemini
-llm_service_gemini = LLMServiceGemini()
-web_scraper = WebScraperService()
-pdf_processor = PDFProcessorService()
-quality_checker = QualityCheckerService()
-pdf_generator = PDFGeneratorService()
-translation_service = TranslationService()
+
+def init_services() -> None:
+    """Create all service singletons up front so the first request doesn't pay for client setup"""
+    get_llm_service()
+    get_llm_service_gemini()
+    get_llm_batcher()
+    get_quality_batcher()
+    get_web_scraper()
+    get_pdf_processor()
+    get_quality_checker()
+    get_pdf_generator()
+    get_translation_service()
+    # May download the tokenizer; do it at startup rather than on the first request
+    get_token_encoding()
+
+# Parsed layouts keyed by their sorted-key JSON
+_layout_cache: LRUCache = LRUCache(maxsize=128)
+
+# Built once at import for form-encoded url_instructions
+_url_instructions_adapter = TypeAdapter(List[UrlContentInstruction])
+# Encodes the final streamed article straight to JSON bytes in pydantic-core
+_article_response_adapter = TypeAdapter(ArticleResponse)
+
+# Bounds in-flight generations so an upstream LLM slowdown can't pile up requests
+_generation_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_GENERATIONS)
+
+# Finished articles keyed by model and generation context, and quality scores keyed by
+# article and quality context; repeat requests skip the LLM entirely
+_article_cache = AsyncTTLCache(maxsize=settings.LLM_RESULT_CACHE_MAXSIZE, ttl=settings.LLM_RESULT_CACHE_TTL)
+_quality_cache = AsyncTTLCache(maxsize=settings.LLM_RESULT_CACHE_MAXSIZE, ttl=settings.LLM_RESULT_CACHE_TTL)
+
+# Deferred analysis jobs keyed by job id, expired after ANALYSIS_JOB_TTL
+_analysis_jobs: TTLCache = TTLCache(maxsize=settings.ANALYSIS_JOB_MAXSIZE, ttl=settings.ANALYSIS_JOB_TTL)
 
 class PDFGenerationRequest(BaseModel):
     content: str
@@ -43,6 +78,10 @@ class TranslationRequest(BaseModel):
     layout: dict = {}
     source_usage_details: list = []
 
+class AnalysisJobResponse(BaseModel):
+    status: str  # pending | completed | failed
+    analysis: Optional[ArticleAnalysis] = None
+
 class TranslationResponse(BaseModel):
     markdown_content: str
     layout: dict
@@ -52,25 +91,26 @@ class TranslationResponse(BaseModel):
     error: str = None
 
 @router.post("/generate-pdf", response_model=PDFGenerationResponse)
-async def generate_pdf(request: PDFGenerationRequest):
+async def generate_pdf(request: PDFGenerationRequest, pdf_generator: PDFGeneratorService = Depends(get_pdf_generator)):
     """Generate PDF from Markdown content using AI"""
     
     logger.info("PDF generation endpoint called")
-    logger.info(f"Request content length: {len(request.content)}")
-    logger.info(f"Include quality info: {request.include_quality_info}")
-    logger.info(f"Quality score: {request.quality_score}")
-    logger.info(f"Iterations: {request.iterations}")
+    logger.info("Request content length: %d", len(request.content))
+    logger.info("Include quality info: %s", request.include_quality_info)
+    logger.info("Quality score: %s", request.quality_score)
+    logger.info("Iterations: %s", request.iterations)
     
     try:
         logger.info("Calling PDF generator service...")
-        pdf_base64 = pdf_generator.generate_pdf_with_ai(
+        pdf_base64 = await run_llm_call(
+            pdf_generator.generate_pdf_with_ai,
             content=request.content,
             include_quality_info=request.include_quality_info,
             quality_score=request.quality_score,
             iterations=request.iterations
         )
         
-        logger.info(f"PDF generator returned result with length: {len(pdf_base64) if pdf_base64 else 0}")
+        logger.info("PDF generator returned result with length: %d", len(pdf_base64) if pdf_base64 else 0)
         
         if not pdf_base64:
             logger.error("PDF generator returned empty content")
@@ -80,70 +120,350 @@ async def generate_pdf(request: PDFGenerationRequest):
         return PDFGenerationResponse(pdf_base64=pdf_base64)
         
     except HTTPException as e:
-        logger.error(f"HTTP Exception in PDF generation: {e.detail}")
+        logger.error("HTTP Exception in PDF generation: %s", e.detail)
         raise e
     except Exception as e:
-        logger.error(f"Unexpected error in PDF generation: {str(e)}")
-        logger.error(f"Error type: {type(e).__name__}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception("Unexpected error in PDF generation (%s): %s", type(e).__name__, e)
         raise HTTPException(status_code=500, detail=f"Error generating PDF: {str(e)}")
 
+@router.post("/generate-pdf/raw")
+async def generate_pdf_raw(request: PDFGenerationRequest, pdf_generator: PDFGeneratorService = Depends(get_pdf_generator)):
+    """Generate the print-ready document and return it as raw bytes
+    
+    Same document as /generate-pdf, without the base64 wrapping in a JSON body.
+    """
+    
+    logger.info("Raw PDF generation endpoint called")
+    logger.info("Request content length: %d", len(request.content))
+    
+    try:
+        html_content = await run_llm_call(
+            pdf_generator.generate_html_with_ai,
+            content=request.content,
+            include_quality_info=request.include_quality_info,
+            quality_score=request.quality_score,
+            iterations=request.iterations
+        )
+    except Exception as e:
+        logger.exception("Unexpected error in PDF generation (%s): %s", type(e).__name__, e)
+        raise HTTPException(status_code=500, detail=f"Error generating PDF: {str(e)}")
+    
+    return Response(
+        content=html_content.encode('utf-8'),
+        media_type="text/html; charset=utf-8",
+        headers={"Content-Disposition": 'inline; filename="article.html"'}
+    )
+
 @router.post("/generate-article", response_model=ArticleResponse)
-async def generate_article(request: ArticleRequest):
+async def generate_article(request: ArticleRequest, background_tasks: BackgroundTasks,
+                           http_client: httpx.AsyncClient = Depends(get_http_client),
+                           process_pool: Executor = Depends(get_process_pool)):
     """Generate an article based on provided parameters"""
+    return await _generate_article(request, http_client, process_pool, background_tasks)
+
+@router.post("/generate-article/multipart", response_model=ArticleResponse)
+async def generate_article_multipart(
+    background_tasks: BackgroundTasks,
+    http_client: httpx.AsyncClient = Depends(get_http_client),
+    process_pool: Executor = Depends(get_process_pool),
+    topic_category: Optional[str] = Form(None),
+    industry: Optional[str] = Form(None),
+    target_audience: Optional[str] = Form(None),
+    source_url: Optional[str] = Form(None),
+    source_urls: Optional[List[str]] = Form(None),
+    url_instructions: Optional[str] = Form(None),
+    seo_keywords: Optional[str] = Form(None),
+    custom_prompt: Optional[str] = Form(None),
+    include_thai_translation: bool = Form(False),
+    selected_model: str = Form('gpt-finetune'),
+    defer_analysis: bool = Form(False),
+    regenerate: bool = Form(False),
+    pdf: Optional[UploadFile] = File(None)
+):
+    """Generate an article from form fields and a raw PDF upload
     
+    Same as /generate-article, but the PDF is sent as a file part so it
+    skips the base64 encode/decode round-trip.
+    """
+    try:
+        request = ArticleRequest(
+            topic_category=topic_category,
+            industry=industry,
+            target_audience=target_audience,
+            source_url=source_url,
+            source_urls=source_urls,
+            url_instructions=_url_instructions_adapter.validate_json(url_instructions) if url_instructions else None,
+            seo_keywords=seo_keywords,
+            custom_prompt=custom_prompt,
+            include_thai_translation=include_thai_translation,
+            selected_model=selected_model,
+            defer_analysis=defer_analysis,
+            regenerate=regenerate
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+    
+    pdf_bytes = await pdf.read() if pdf is not None else None
+    return await _generate_article(request, http_client, process_pool, background_tasks, pdf_bytes or None)
+
+async def _generate_article(request: ArticleRequest, http_client: httpx.AsyncClient, process_pool: Executor,
+                            background_tasks: BackgroundTasks,
+                            pdf_bytes: Optional[bytes] = None):
     logger.info("Article generation endpoint called")
-    logger.info(f"Request parameters: topic={request.topic_category}, industry={request.industry}")
-    logger.info(f"Has source URL: {bool(request.source_url)}")
-    logger.info(f"Has PDF: {bool(request.pdf_base64)}")
-    logger.info(f"Raw include_thai_translation: {repr(request.include_thai_translation)}")
-    logger.info(f"Type of include_thai_translation: {type(request.include_thai_translation)}")
+    logger.info("Request parameters: topic=%s, industry=%s", request.topic_category, request.industry)
+    logger.info("Has source URL: %s", bool(request.source_url))
+    logger.info("Has PDF: %s", bool(request.pdf_base64 or pdf_bytes))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Raw include_thai_translation: %r", request.include_thai_translation)
+        logger.debug("Type of include_thai_translation: %s", type(request.include_thai_translation))
     
+    await _acquire_generation_slot()
     try:
         # Build generation context
         logger.info("Building generation context...")
-        context = await _build_generation_context(request)
+        context = await _build_generation_context(request, http_client, process_pool, pdf_bytes)
         logger.info("Generation context built successfully")
         
         # Generate article with quality loop
         logger.info("Starting article generation with quality loop...")
-        logger.info(f"Request include_thai_translation: {request.include_thai_translation}")
-        logger.info(f"Selected model: {request.selected_model}")
-        article_data = await _generate_with_quality_loop(context, request.include_thai_translation, request.selected_model)
+        logger.info("Request include_thai_translation: %s", request.include_thai_translation)
+        logger.info("Selected model: %s", request.selected_model)
+        article_data = await _cached_generation(context, request.include_thai_translation, request.selected_model,
+                                                analyze=not request.defer_analysis, regenerate=request.regenerate)
         logger.info("Article generation completed successfully")
         
-        # Generate article analysis
-        logger.info("Starting article analysis...")
-        try:
-            # Use the same model for analysis as for generation
-            selected_llm = llm_service_gemini if request.selected_model == 'gemini-pro' else llm_service
-            analysis_result = selected_llm.analyze_article(article_data["content"], context)
-            article_data["analysis"] = {
-                "strengths": analysis_result.get("strengths", []),
-                "weaknesses": analysis_result.get("weaknesses", []),
-                "recommendations": analysis_result.get("recommendations", []),
-                "summary": analysis_result.get("summary", "")
-            }
-            logger.info("Article analysis completed successfully")
-        except Exception as e:
-            logger.error(f"Article analysis failed: {str(e)}")
-            # Continue without analysis if it fails
-            article_data["analysis"] = None
+        # Analysis ran with the generation unless deferred to a background task the client can poll
+        if request.defer_analysis:
+            job_id = uuid.uuid4().hex
+            _analysis_jobs[job_id] = {"status": "pending"}
+            background_tasks.add_task(_run_analysis_job, job_id, article_data["content"], context, request.selected_model)
+            article_data["analysis_job_id"] = job_id
         
         return ArticleResponse(**article_data)
         
     except HTTPException as e:
-        logger.error(f"HTTP Exception in article generation: {e.detail}")
+        logger.error("HTTP Exception in article generation: %s", e.detail)
         raise e
     except Exception as e:
-        logger.error(f"Unexpected error in article generation: {str(e)}")
-        logger.error(f"Error type: {type(e).__name__}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception("Unexpected error in article generation (%s): %s", type(e).__name__, e)
         raise HTTPException(status_code=500, detail=f"Error generating article: {str(e)}")
+    finally:
+        _generation_semaphore.release()
+
+@router.post("/generate-article/stream")
+async def generate_article_stream(request: ArticleRequest,
+                                  http_client: httpx.AsyncClient = Depends(get_http_client),
+                                  process_pool: Executor = Depends(get_process_pool)):
+    """Generate an article, streaming progress as Server-Sent Events"""
+    
+    logger.info("Streaming article generation endpoint called")
+    
+    # Context errors (bad URLs, failed scrapes) surface as regular HTTP errors before streaming starts
+    await _acquire_generation_slot()
+    try:
+        context = await _build_generation_context(request, http_client, process_pool)
+    except BaseException:
+        _generation_semaphore.release()
+        raise
+    
+    async def event_stream():
+        events: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(_run_streamed_generation(request, context, events))
+        try:
+            while True:
+                event, data = await events.get()
+                yield _sse_event(event, data)
+                if event in ("done", "error"):
+                    break
+        finally:
+            task.cancel()
+    
+    return StreamingResponse(
+        _GenerationSlotStream(event_stream()),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _acquire_generation_slot() -> None:
+    """Wait briefly for a generation slot, rejecting the request with 503 when at capacity"""
+    
+    try:
+        await asyncio.wait_for(_generation_semaphore.acquire(), timeout=settings.GENERATION_ADMISSION_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("Rejecting article generation: %d generations already running", settings.MAX_CONCURRENT_GENERATIONS)
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy generating other articles, please retry shortly",
+            headers={"Retry-After": "5"}
+        )
+
+class _GenerationSlotStream:
+    """SSE body that gives its generation slot back exactly once
+    
+    The slot is released when the body ends, fails or is closed, and also when the response
+    is dropped before the body was ever iterated (client gone before streaming started).
+    """
+    
+    def __init__(self, body: AsyncIterator[bytes]):
+        self._body = body
+        self._released = False
+    
+    def __aiter__(self) -> "_GenerationSlotStream":
+        return self
+    
+    async def __anext__(self) -> bytes:
+        try:
+            return await self._body.__anext__()
+        except BaseException:
+            self._release()
+            raise
+    
+    async def aclose(self) -> None:
+        try:
+            await self._body.aclose()
+        finally:
+            self._release()
+    
+    def _release(self) -> None:
+        if not self._released:
+            self._released = True
+            _generation_semaphore.release()
+    
+    def __del__(self) -> None:
+        self._release()
+
+async def _run_streamed_generation(request: ArticleRequest, context: GenerationContext, events: asyncio.Queue) -> None:
+    """Run the generation pipeline, publishing token/quality/analysis/done events"""
+    
+    try:
+        article_data = await _generate_with_quality_loop(context, request.include_thai_translation, request.selected_model, events,
+                                                         analyze=True, use_cache=not request.regenerate)
+        events.put_nowait(("analysis", article_data["analysis"]))
+        events.put_nowait(("done", _article_response_adapter.dump_json(ArticleResponse(**article_data))))
+    except HTTPException as e:
+        logger.error("HTTP Exception in streamed article generation: %s", e.detail)
+        events.put_nowait(("error", {"status_code": e.status_code, "detail": e.detail}))
+    except Exception as e:
+        logger.error("Unexpected error in streamed article generation: %s", e)
+        events.put_nowait(("error", {"status_code": 500, "detail": f"Error generating article: {str(e)}"}))
+
+async def _analyze_article(content: str, context: GenerationContext, selected_model: str) -> Optional[Dict[str, Any]]:
+    """Generate article analysis, returning None if it fails"""
+    
+    logger.info("Starting article analysis...")
+    try:
+        # Analyze with the same provider that generated the article
+        if selected_model == 'gemini-pro':
+            analysis_result = await get_llm_service_gemini().aanalyze_article(content, context)
+        else:
+            analysis_result = await run_llm_call(get_llm_service().analyze_article, content, context)
+        logger.info("Article analysis completed successfully")
+        return {
+            "strengths": analysis_result.get("strengths", []),
+            "weaknesses": analysis_result.get("weaknesses", []),
+            "recommendations": analysis_result.get("recommendations", []),
+            "summary": analysis_result.get("summary", "")
+        }
+    except Exception as e:
+        logger.error("Article analysis failed: %s", e)
+        # Continue without analysis if it fails
+        return None
+
+async def _run_analysis_job(job_id: str, content: str, context: GenerationContext, selected_model: str) -> None:
+    """Run a deferred analysis and store its result for polling"""
+    
+    analysis = await _analyze_article(content, context, selected_model)
+    _analysis_jobs[job_id] = {"status": "completed" if analysis else "failed", "analysis": analysis}
+
+@router.get("/analysis/{job_id}", response_model=AnalysisJobResponse)
+async def get_analysis(job_id: str, response: Response):
+    """Poll the result of a deferred article analysis"""
+    
+    job = _analysis_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analysis job not found or expired")
+    
+    if job["status"] == "pending":
+        response.status_code = 202
+        response.headers["Retry-After"] = "2"
+    return AnalysisJobResponse(**job)
 
-async def _build_generation_context(request: ArticleRequest) -> GenerationContext:
+class _DraftRejected(Exception):
+    """Raised when the opening of a streamed draft already scores well below threshold"""
+    
+    def __init__(self, quality_feedback: QualityFeedback):
+        super().__init__(quality_feedback.feedback)
+        self.quality_feedback = quality_feedback
+
+async def _stream_article(context: GenerationContext, feedback: Optional[str], selected_model: str, iteration: int,
+                          events: asyncio.Queue, quality_context: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
+    """Generate an article while publishing response chunks as token events
+    
+    Each event carries the raw JSON chunk as "text" and the newly decoded part of
+    the article Markdown as "content".
+    
+    Unless this is the last iteration, the opening of the draft is scored in the
+    background once EARLY_QUALITY_CHECK_CHARS have streamed; a clearly failing
+    draft stops generating and raises _DraftRejected.
+    """
+    
+    # Gemini streams on its async client; the OpenAI SDK stream is consumed on an LLM thread
+    if selected_model == 'gemini-pro':
+        llm_service = get_llm_service_gemini()
+        source = llm_service.agenerate_article_stream(context, feedback, use_cache)
+    else:
+        llm_service = get_llm_service()
+        source = iterate_in_thread(llm_service.generate_article_stream, context, feedback, use_cache, executor=get_llm_executor())
+    content_reader = JsonStringFieldReader("content")
+    chunks = []
+    streamed = 0
+    check_at = settings.EARLY_QUALITY_CHECK_CHARS if iteration < settings.MAX_QUALITY_ITERATIONS else 0
+    early_check: Optional[asyncio.Task] = None
+    checked = False
+    
+    try:
+        async with aclosing(source) as stream:
+            async for chunk in stream:
+                chunks.append(chunk)
+                events.put_nowait(("token", {"iteration": iteration, "text": chunk, "content": content_reader.feed(chunk)}))
+                streamed += len(chunk)
+                
+                if early_check is None and check_at and streamed >= check_at:
+                    early_check = asyncio.create_task(run_llm_call(
+                        get_quality_checker().evaluate_incremental, "".join(chunks), quality_context
+                    ))
+                elif early_check is not None and not checked and early_check.done():
+                    checked = True
+                    _check_partial_quality(early_check, iteration, events)
+    finally:
+        if early_check is not None and not early_check.done():
+            early_check.cancel()
+    
+    return llm_service.parse_article_response("".join(chunks))
+
+def _check_partial_quality(early_check: asyncio.Task, iteration: int, events: asyncio.Queue) -> None:
+    """Raise _DraftRejected if a finished early check scored clearly below threshold"""
+    
+    if early_check.exception() is not None:
+        logger.warning("Early quality check failed, continuing generation: %s", early_check.exception())
+        return
+    
+    quality_feedback = early_check.result()
+    logger.info("Early quality estimate for iteration %d: %.2f", iteration, quality_feedback.score)
+    if quality_feedback.score >= settings.QUALITY_THRESHOLD - settings.EARLY_QUALITY_REJECT_MARGIN:
+        return
+    
+    events.put_nowait(("quality", {
+        "iteration": iteration,
+        "score": quality_feedback.score,
+        "feedback": quality_feedback.feedback,
+        "suggestions": quality_feedback.suggestions,
+        "partial": True
+    }))
+    raise _DraftRejected(quality_feedback)
+
+async def _build_generation_context(request: ArticleRequest, http_client: httpx.AsyncClient, process_pool: Executor,
+                                    pdf_bytes: Optional[bytes] = None) -> GenerationContext:
     """Build generation context from request"""
     
     logger.info("Building generation context...")
@@ -154,157 +474,242 @@ async def _build_generation_context(request: ArticleRequest) -> GenerationContex
         "seo_keywords": parse_seo_keywords(request.seo_keywords),
         "custom_prompt": request.custom_prompt
     }
-    logger.info(f"Basic context data prepared: {list(context_data.keys())}")
+    if request.url_instructions:
+        # Validated at the API boundary; carried internally as plain slotted records
+        context_data["url_instructions"] = [UrlInstruction(**u.model_dump()) for u in request.url_instructions]
+    logger.info("Basic context data prepared: %s", list(context_data))
     
-    # Process source URLs if provided
+    # Process source URLs if provided: the single source_url (kept for backward
+    # compatibility) then source_urls, deduplicated, validated and capped at 5 in one pass
     urls_to_process = []
+    seen = set()
+    for url in chain((request.source_url,) if request.source_url else (), request.source_urls or ()):
+        if url in seen:
+            continue
+        if not validate_url(url):
+            logger.error("Invalid URL format: %s", url)
+            raise HTTPException(status_code=400, detail=f"Invalid URL format: {url}")
+        seen.add(url)
+        urls_to_process.append(url)
+        if len(urls_to_process) == 5:
+            break
     
-    # Handle backward compatibility with single source_url
-    if request.source_url:
-        urls_to_process.append(request.source_url)
-    
-    # Handle new multiple source_urls
-    if request.source_urls:
-        urls_to_process.extend(request.source_urls)
-    
-    # Remove duplicates and limit to 5
-    urls_to_process = list(dict.fromkeys(urls_to_process))[:5]
+    if urls_to_process:
+        logger.info("Processing %d source URLs", len(urls_to_process))
     
+    # Scraping and PDF extraction are independent, run them side by side
+    steps = []
     if urls_to_process:
-        logger.info(f"Processing {len(urls_to_process)} source URLs")
-        
-        # Validate all URLs
-        for url in urls_to_process:
-            if not validate_url(url):
-                logger.error(f"Invalid URL format: {url}")
-                raise HTTPException(status_code=400, detail=f"Invalid URL format: {url}")
-        
-        try:
-            logger.info("Starting web scraping for multiple URLs...")
-            if len(urls_to_process) == 1:
-                # Single URL - use backward compatible method
-                scraped_content = web_scraper.scrape_url(urls_to_process[0])
-                context_data["scraped_content"] = scraped_content
-                logger.info(f"Web scraping completed. Content length: {len(scraped_content) if scraped_content else 0}")
-            else:
-                # Multiple URLs - use new method
-                scraped_sources = web_scraper.scrape_multiple_urls(urls_to_process, max_urls=5)
-                context_data["scraped_sources"] = scraped_sources
-                logger.info(f"Multiple URL scraping completed. Sources scraped: {len(scraped_sources)}")
-                for i, source in enumerate(scraped_sources, 1):
-                    logger.info(f"Source {i}: {source['title']} - {len(source['content'])} characters")
-        except Exception as e:
-            logger.error(f"Web scraping failed: {str(e)}")
-            raise HTTPException(status_code=400, detail=f"Error scraping URLs: {str(e)}")
+        steps.append(_scrape_sources(urls_to_process, http_client))
+    if pdf_bytes or request.pdf_base64:
+        steps.append(_process_pdf(request.pdf_base64, pdf_bytes, process_pool))
     
-    # Process PDF if provided
-    if request.pdf_base64:
-        logger.info("Processing PDF content...")
-        try:
-            pdf_content = pdf_processor.process_pdf_base64(request.pdf_base64)
-            context_data["pdf_content"] = pdf_content
-            logger.info(f"PDF processing completed. Content length: {len(pdf_content) if pdf_content else 0}")
-        except Exception as e:
-            logger.error(f"PDF processing failed: {str(e)}")
-            raise HTTPException(status_code=400, detail=f"Error processing PDF: {str(e)}")
+    results = await asyncio.gather(*steps, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+        context_data.update(result)
     
     logger.info("Generation context built successfully")
     return GenerationContext(**context_data)
 
-async def _generate_with_quality_loop(context: GenerationContext, include_thai_translation: bool = False, selected_model: str = 'gpt-finetune') -> Dict[str, Any]:
-    """Generate article with quality checking and iterative improvement"""
+async def _scrape_sources(urls_to_process: List[str], http_client: httpx.AsyncClient) -> Dict[str, Any]:
+    """Scrape source URLs into generation context fields"""
+    
+    try:
+        logger.info("Starting web scraping over shared HTTP client...")
+        if len(urls_to_process) == 1:
+            # Single URL - keep backward compatible plain content
+            source = await get_web_scraper().ascrape_url_with_metadata(urls_to_process[0], http_client)
+            scraped_content = source["content"]
+            logger.info("Web scraping completed. Content length: %d", len(scraped_content) if scraped_content else 0)
+            return {"scraped_content": scraped_content}
+        
+        # Multiple URLs - fetch concurrently
+        scraped_sources = await get_web_scraper().ascrape_many(urls_to_process, http_client, max_urls=5)
+        logger.info("Multiple URL scraping completed. Sources scraped: %d", len(scraped_sources))
+        for i, source in enumerate(scraped_sources, 1):
+            logger.info("Source %d: %s - %d characters", i, source['title'], len(source['content']))
+        return {"scraped_sources": scraped_sources}
+    except Exception as e:
+        logger.error("Web scraping failed: %s", e)
+        raise HTTPException(status_code=400, detail=f"Error scraping URLs: {str(e)}")
+
+async def _process_pdf(pdf_base64: Optional[str], pdf_bytes: Optional[bytes], process_pool: Executor) -> Dict[str, Any]:
+    """Extract PDF text into generation context fields"""
+    
+    logger.info("Processing PDF content...")
+    try:
+        if pdf_bytes:
+            pdf_content = await get_pdf_processor().aprocess_pdf_bytes(pdf_bytes, process_pool)
+        else:
+            pdf_content = await get_pdf_processor().aprocess_pdf_base64(pdf_base64, process_pool)
+        logger.info("PDF processing completed. Content length: %d", len(pdf_content) if pdf_content else 0)
+        return {"pdf_content": pdf_content}
+    except Exception as e:
+        logger.error("PDF processing failed: %s", e)
+        raise HTTPException(status_code=400, detail=f"Error processing PDF: {str(e)}")
+
+async def _cached_generation(context: GenerationContext, include_thai_translation: bool, selected_model: str,
+                             analyze: bool = False, regenerate: bool = False) -> Dict[str, Any]:
+    """Run the quality loop, reusing the finished article for an identical request
+    
+    Cache hits report iterations=0. With regenerate, no cached article or draft is reused and
+    the new article replaces the cached one. A fresh dict is returned so callers can add fields.
+    """
+    
+    key = content_hash(f"{selected_model}|{include_thai_translation}|{analyze}|{context.model_dump_json()}")
+    if regenerate:
+        result = await _generate_with_quality_loop(context, include_thai_translation, selected_model, analyze=analyze,
+                                                   use_cache=False)
+        _article_cache.set(key, result)
+        return dict(result)
+    
+    cached = _article_cache.get(key)
+    if cached is not None:
+        logger.info("Serving article from result cache")
+        return {**cached, "iterations": 0}
+    
+    return dict(await _article_cache.get_or_set(
+        key,
+        lambda: _generate_with_quality_loop(context, include_thai_translation, selected_model, analyze=analyze)
+    ))
+
+async def _generate_with_quality_loop(context: GenerationContext, include_thai_translation: bool = False, selected_model: str = 'gpt-finetune', events: Optional[asyncio.Queue] = None,
+                                      analyze: bool = False, use_cache: bool = True) -> Dict[str, Any]:
+    """Generate article with quality checking and iterative improvement
+    
+    When an events queue is given, generated tokens and quality scores are published to it as they arrive.
+    With analyze, the final article is also analyzed, concurrently with its Thai translation;
+    non-streamed Gemini drafts carry their analysis from the generation call itself.
+    Without use_cache, drafts are never replayed from the LLM response caches.
+    """
+    
+    # Loop bounds are fixed for the request, read them once
+    max_iterations = settings.MAX_QUALITY_ITERATIONS
+    quality_threshold = settings.QUALITY_THRESHOLD
+    plateau_epsilon = settings.QUALITY_PLATEAU_EPSILON
+    accept_threshold = quality_threshold - settings.QUALITY_ACCEPT_MARGIN
     
     iteration = 0
     feedback = None
+    next_draft: Optional[asyncio.Task] = None
+    translation_task: Optional[asyncio.Task] = None
+    completed = False
+    # Latest non-regressing draft: (quality_feedback, content, layout_data, article_result, translation_task)
+    best: Optional[tuple] = None
     
-    while iteration < settings.MAX_QUALITY_ITERATIONS:
-        iteration += 1
-        
-        # Generate article using selected model
-        try:
-            logger.info(f"Using model: {selected_model}")
+    # Quality context is invariant across iterations, build it once
+    quality_context = {
+        "topic_category": context.topic_category,
+        "industry": context.industry,
+        "target_audience": context.target_audience,
+        "seo_keywords": ", ".join(context.seo_keywords) if context.seo_keywords else None
+    }
+    
+    try:
+        while iteration < max_iterations:
+            iteration += 1
+            
+            # Generate article using selected model (batched and run off the event loop),
+            # or pick up the draft speculatively started during the previous evaluation
+            try:
+                logger.info("Using model: %s", selected_model)
+                if next_draft is not None:
+                    article_result = await next_draft
+                    next_draft = None
+                else:
+                    article_result = await _generate_draft(context, feedback, selected_model, iteration, events, quality_context,
+                                                           analyze=analyze, use_cache=use_cache)
+            except _DraftRejected as e:
+                # Opening already failed the quality bar, start the next iteration right away
+                logger.info("Abandoning draft %d after early quality check", iteration)
+                feedback = _format_feedback(e.quality_feedback)
+                continue
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Error in article generation: {str(e)}")
+            
+            # Extract content and layout
             if selected_model == 'gemini-pro':
-                article_result = llm_service_gemini.generate_article(context, feedback)
+                content = article_result.get("html_content", "") or article_result.get("content", "")
             else:
-                article_result = llm_service.generate_article(context, feedback)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error in article generation: {str(e)}")
-        
-        # Extract content and layout
-        if selected_model == 'gemini-pro':
-            content = article_result.get("html_content", "") or article_result.get("content", "")
-        else:
-            content = article_result.get("markdown_content", "") or article_result.get("content", "")
-        layout_data = article_result.get("layout", {})
-        
-        if not content:
-            raise HTTPException(status_code=500, detail="Generated article has no content")
-        
-        # Evaluate quality
-        quality_context = {
-            "topic_category": context.topic_category,
-            "industry": context.industry,
-            "target_audience": context.target_audience,
-            "seo_keywords": ", ".join(context.seo_keywords) if context.seo_keywords else None
-        }
-        
-        try:
-            quality_feedback = quality_checker.evaluate_article_quality(content, quality_context)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error in quality evaluation: {str(e)}")
-        
-        # Check if quality meets threshold
-        if quality_feedback.score >= settings.QUALITY_THRESHOLD:
-            # Quality is acceptable, prepare result
-            result = {
-                "content": content,
-                "layout": _parse_layout(layout_data),
-                "quality_score": quality_feedback.score,
-                "iterations": iteration,
-                "source_usage_details": article_result.get("source_usage_details", [])
-            }
+                content = article_result.get("markdown_content", "") or article_result.get("content", "")
+            layout_data = article_result.get("layout", {})
             
-            # Generate Thai translation if requested
-            logger.info(f"Include Thai translation flag: {include_thai_translation}")
+            if not content:
+                raise HTTPException(status_code=500, detail="Generated article has no content")
+            
+            # Start Thai translation speculatively so it overlaps with quality evaluation;
+            # the task is cancelled (stopping the API call) if this draft gets rejected
+            translation_task = None
             if include_thai_translation:
-                try:
-                    logger.info("Generating Thai translation...")
-                    logger.info(f"Content length for translation: {len(content)}")
-                    thai_result = translation_service.translate_to_thai(
-                        markdown_content=content,
-                        layout_data=layout_data,
-                        source_usage_details=article_result.get("source_usage_details", [])
-                    )
-                    
-                    logger.info(f"Thai translation result keys: {list(thai_result.keys())}")
-                    logger.info(f"Translation success: {thai_result.get('translation_success', False)}")
-                    
-                    if thai_result.get('translation_success', False):
-                        result["thai_content"] = thai_result["markdown_content"]
-                        result["thai_layout"] = _parse_layout(thai_result["layout"])
-                        logger.info(f"Thai translation completed successfully. Thai content length: {len(thai_result['markdown_content'])}")
-                    else:
-                        logger.warning(f"Thai translation failed: {thai_result.get('error', 'Unknown error')}")
-                        
-                except Exception as e:
-                    logger.error(f"Error generating Thai translation: {str(e)}")
-                    # Don't fail the whole request if translation fails
-                    pass
+                logger.info("Starting speculative Thai translation...")
+                translation_task = asyncio.create_task(
+                    _translate_draft(content, layout_data, article_result.get("source_usage_details", []))
+                )
             
-            logger.info(f"Final result keys: {list(result.keys())}")
-            if 'thai_content' in result:
-                logger.info(f"Returning result with Thai content. Thai content length: {len(result['thai_content'])}")
-            else:
-                logger.info("Returning result without Thai content")
+            # Start the next draft while this one is evaluated, reusing the latest known feedback
+            # (or generic revision guidance on the first pass); it becomes the next iteration if
+            # this draft fails and is cancelled if it passes. Streamed drafts are never speculated.
+            if settings.SPECULATIVE_NEXT_DRAFT and events is None and iteration < max_iterations:
+                next_draft = asyncio.create_task(
+                    _generate_draft(context, feedback or _SPECULATIVE_FEEDBACK, selected_model, iteration + 1, None, quality_context,
+                                    analyze=analyze, use_cache=use_cache)
+                )
             
-            return result
-        
-        # Quality below threshold, prepare feedback for next iteration
-        if iteration < settings.MAX_QUALITY_ITERATIONS:
-            feedback = f"Quality score: {quality_feedback.score:.2f}. {quality_feedback.feedback} Suggestions: {'; '.join(quality_feedback.suggestions)}"
+            # Evaluate quality
+            try:
+                quality_feedback = await _quality_cache.get_or_set(
+                    content_hash(orjson.dumps([content, quality_context])),
+                    lambda: get_quality_batcher().submit(get_quality_checker(), content, quality_context)
+                )
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Error in quality evaluation: {str(e)}")
+            
+            if events is not None:
+                events.put_nowait(("quality", {
+                    "iteration": iteration,
+                    "score": quality_feedback.score,
+                    "feedback": quality_feedback.feedback,
+                    "suggestions": quality_feedback.suggestions
+                }))
+            
+            # Revisions stopped helping, fall back to the best draft so far
+            if best is not None and quality_feedback.score <= best[0].score - plateau_epsilon:
+                logger.info("Draft %d scored %.2f, below best %.2f; stopping", iteration, quality_feedback.score, best[0].score)
+                if translation_task:
+                    translation_task.cancel()
+                break
+            
+            # This draft supersedes the previous best, whose translation is no longer needed
+            if best is not None and best[4]:
+                best[4].cancel()
+            best = (quality_feedback, content, layout_data, article_result, translation_task)
+            
+            # Quality is acceptable (or close enough after a revision), stop here
+            if quality_feedback.score >= quality_threshold or (iteration >= 2 and quality_feedback.score >= accept_threshold):
+                break
+            
+            # Quality below threshold, prepare feedback for next iteration
+            # (never on the last one, so this formats at most MAX_QUALITY_ITERATIONS - 1 times)
+            if iteration < max_iterations:
+                feedback = _format_feedback(quality_feedback)
+        completed = True
+    finally:
+        # A speculative draft is only still pending if we are leaving early
+        if next_draft is not None:
+            next_draft.cancel()
+        # On failure no draft is returned, so translations still running for one are abandoned
+        if not completed:
+            for task in (translation_task, best[4] if best is not None else None):
+                if task is not None:
+                    task.cancel()
     
-    # Max iterations reached, return best attempt
-    final_result = {
+    quality_feedback, content, layout_data, article_result, translation_task = best
+    
+    # Single exit for both the accepted draft and the max-iterations fallback,
+    # so the layout is parsed exactly once
+    result = {
         "content": content,
         "layout": _parse_layout(layout_data),
         "quality_score": quality_feedback.score,
@@ -312,77 +717,134 @@ async def _generate_with_quality_loop(context: GenerationContext, include_thai_t
         "source_usage_details": article_result.get("source_usage_details", [])
     }
     
-    # Generate Thai translation if requested (even for lower quality articles)
-    if include_thai_translation:
-        try:
-            logger.info("Generating Thai translation for final result...")
-            thai_result = translation_service.translate_to_thai(
-                markdown_content=content,
-                layout_data=layout_data,
-                source_usage_details=article_result.get("source_usage_details", [])
-            )
-            
-            if thai_result.get('translation_success', False):
-                final_result["thai_content"] = thai_result["markdown_content"]
-                final_result["thai_layout"] = _parse_layout(thai_result["layout"])
-                logger.info("Final Thai translation completed successfully")
-            else:
-                logger.warning(f"Final Thai translation failed: {thai_result.get('error', 'Unknown error')}")
-                
-        except Exception as e:
-            logger.error(f"Error generating final Thai translation: {str(e)}")
-            # Don't fail the whole request if translation fails
-            pass
+    # Analysis only needs the final content, so it runs alongside the translation,
+    # unless the draft already came back with one
+    if analyze and "analysis" in article_result:
+        result["analysis"] = article_result["analysis"]
+        analyze = False
+    analysis_task = asyncio.create_task(_analyze_article(content, context, selected_model)) if analyze else None
+    try:
+        # Attach Thai translation if requested (even for lower quality articles)
+        logger.info("Include Thai translation flag: %s", include_thai_translation)
+        if translation_task:
+            await _attach_thai_translation(result, translation_task)
+        if analysis_task:
+            result["analysis"] = await analysis_task
+    finally:
+        if analysis_task and not analysis_task.done():
+            analysis_task.cancel()
+    
+    logger.info("Final result keys: %s", list(result))
+    if 'thai_content' in result:
+        logger.info("Returning result with Thai content. Thai content length: %d", len(result['thai_content']))
+    else:
+        logger.info("Returning result without Thai content")
+    
+    return result
+
+# Feedback for a speculative first retry, before any real evaluation feedback exists
+_SPECULATIVE_FEEDBACK = "Improve depth of insight, concrete examples and a stronger call-to-action."
+
+async def _generate_draft(context: GenerationContext, feedback: Optional[str], selected_model: str, iteration: int,
+                          events: Optional[asyncio.Queue], quality_context: Dict[str, Any], analyze: bool = False,
+                          use_cache: bool = True) -> Dict[str, Any]:
+    """Generate one draft with the selected model, streaming tokens when an events queue is given
+    
+    With analyze, Gemini drafts come back with their analysis from the same call.
+    """
     
-    return final_result
+    if events is not None:
+        return await _stream_article(context, feedback, selected_model, iteration, events, quality_context, use_cache)
+    if analyze and selected_model == 'gemini-pro':
+        # The batcher only gathers Gemini calls, so the fused call goes out directly
+        return await get_llm_service_gemini().agenerate_and_analyze(context, feedback, use_cache=use_cache)
+    selected_llm = get_llm_service_gemini() if selected_model == 'gemini-pro' else get_llm_service()
+    return await get_llm_batcher().submit(selected_llm, context, feedback, use_cache)
+
+def _format_feedback(quality_feedback: QualityFeedback) -> str:
+    """Render quality feedback as the prompt feedback for the next iteration"""
+    return f"Quality score: {quality_feedback.score:.2f}. {quality_feedback.feedback} Suggestions: {'; '.join(quality_feedback.suggestions)}"
+
+async def _translate_draft(content: str, layout_data: Dict[str, Any], source_usage_details: List[Dict[str, str]]) -> Dict[str, Any]:
+    """Translate a draft to Thai on an LLM thread; cancelling stops the call at its next stream chunk"""
+    
+    stop = threading.Event()
+    try:
+        return await run_llm_call(
+            get_translation_service().translate_to_thai,
+            markdown_content=content,
+            layout_data=layout_data,
+            source_usage_details=source_usage_details,
+            stop=stop
+        )
+    except asyncio.CancelledError:
+        # The worker thread can't be interrupted; it checks the flag between stream chunks
+        stop.set()
+        raise
+
+async def _attach_thai_translation(result: Dict[str, Any], translation_task: asyncio.Task) -> None:
+    """Wait for a running Thai translation and merge it into the result"""
+    
+    try:
+        thai_result = await translation_task
+        
+        logger.info("Thai translation result keys: %s", list(thai_result))
+        logger.info("Translation success: %s", thai_result.get('translation_success', False))
+        
+        if thai_result.get('translation_success', False):
+            result["thai_content"] = thai_result["markdown_content"]
+            result["thai_layout"] = _parse_layout(thai_result["layout"])
+            logger.info("Thai translation completed successfully. Thai content length: %d", len(thai_result['markdown_content']))
+        else:
+            logger.warning("Thai translation failed: %s", thai_result.get('error', 'Unknown error'))
+            
+    except Exception as e:
+        logger.error("Error generating Thai translation: %s", e)
+        # Don't fail the whole request if translation fails
 
 def _parse_layout(layout_data: Dict[str, Any]) -> ArticleLayout:
-    """Parse layout data into ArticleLayout model"""
-    
-    sections = layout_data.get("sections", [])
-    image_slots_data = layout_data.get("image_slots", [])
-    
-    image_slots = []
-    for slot_data in image_slots_data:
-        if isinstance(slot_data, dict):
-            image_slots.append(ImageSlot(
-                id=slot_data.get("id", f"img_{len(image_slots)}"),
-                description=slot_data.get("description", "Image placeholder"),
-                position=slot_data.get("position", "article"),
-                suggested_type=slot_data.get("suggested_type", "photo"),
-                placement_rationale=slot_data.get("placement_rationale"),
-                content_guidance=slot_data.get("content_guidance"),
-                dimensions=slot_data.get("dimensions"),
-                aspect_ratio=slot_data.get("aspect_ratio"),
-                alternatives=slot_data.get("alternatives")
-            ))
-    
-    return ArticleLayout(
-        sections=sections,
-        image_slots=image_slots
-    )
+    """Parse layout data into ArticleLayout model
+    
+    Memoized on the serialized layout, so the Thai translation (which usually
+    keeps the English layout) reuses the already-built model.
+    """
+    
+    key = orjson.dumps(layout_data, option=orjson.OPT_SORT_KEYS)
+    layout = _layout_cache.get(key)
+    if layout is None:
+        slots_data = [slot for slot in layout_data.get("image_slots", []) if isinstance(slot, dict)]
+        
+        # Field defaults live on ImageSlot; only the positional id needs filling in.
+        # The whole layout is validated in a single pydantic-core call.
+        layout = ArticleLayout.model_validate({
+            "sections": layout_data.get("sections", []),
+            "image_slots": [{"id": f"img_{i}", **slot} for i, slot in enumerate(slots_data)]
+        })
+        _layout_cache[key] = layout
+    return layout
 
 @router.post("/translate-to-thai", response_model=TranslationResponse)
-async def translate_to_thai(request: TranslationRequest):
+async def translate_to_thai(request: TranslationRequest, translation_service: TranslationService = Depends(get_translation_service)):
     """Translate article content to Thai"""
     
     logger.info("Translation to Thai endpoint called")
-    logger.info(f"Content length: {len(request.markdown_content)}")
-    logger.info(f"Has layout data: {bool(request.layout)}")
-    logger.info(f"Has source usage details: {bool(request.source_usage_details)}")
+    logger.info("Content length: %d", len(request.markdown_content))
+    logger.info("Has layout data: %s", bool(request.layout))
+    logger.info("Has source usage details: %s", bool(request.source_usage_details))
     
     try:
         logger.info("Calling translation service...")
-        translation_result = translation_service.translate_to_thai(
+        translation_result = await run_llm_call(
+            translation_service.translate_to_thai,
             markdown_content=request.markdown_content,
             layout_data=request.layout,
             source_usage_details=request.source_usage_details
         )
         
-        logger.info(f"Translation completed. Success: {translation_result.get('translation_success', False)}")
+        logger.info("Translation completed. Success: %s", translation_result.get('translation_success', False))
         
         if not translation_result.get('translation_success', False):
-            logger.error(f"Translation failed: {translation_result.get('error', 'Unknown error')}")
+            logger.error("Translation failed: %s", translation_result.get('error', 'Unknown error'))
             raise HTTPException(status_code=500, detail=f"Translation failed: {translation_result.get('error', 'Unknown error')}")
         
         return TranslationResponse(
@@ -396,10 +858,82 @@ async def translate_to_thai(request: TranslationRequest):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Translation endpoint error: {str(e)}")
+        logger.error("Translation endpoint error: %s", e)
         raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
 
+@router.post("/translate-to-thai/stream")
+async def translate_to_thai_stream(request: TranslationRequest, translation_service: TranslationService = Depends(get_translation_service)):
+    """Translate article content to Thai, streaming progress as Server-Sent Events
+    
+    Token events carry the raw JSON chunk as "text" and the newly decoded part of the
+    Thai Markdown as "content"; the done event carries the full translation.
+    """
+    
+    logger.info("Streaming translation to Thai endpoint called")
+    logger.info("Content length: %d", len(request.markdown_content))
+    
+    if not request.markdown_content.strip():
+        raise HTTPException(status_code=500, detail="Translation failed: Empty content")
+    
+    async def event_stream():
+        source = iterate_in_thread(
+            translation_service.translate_to_thai_stream,
+            request.markdown_content, request.layout, request.source_usage_details,
+            executor=get_llm_executor()
+        )
+        content_reader = JsonStringFieldReader("thai_content")
+        chunks = []
+        try:
+            async with aclosing(source) as stream:
+                async for chunk in stream:
+                    chunks.append(chunk)
+                    yield _sse_event("token", {"text": chunk, "content": content_reader.feed(chunk)})
+        except Exception as e:
+            logger.error("Streamed translation failed: %s", e)
+            yield _sse_event("error", {"status_code": 500, "detail": f"Translation failed: {str(e)}"})
+            return
+        
+        translation_result = translation_service.parse_translation_response("".join(chunks), request.layout, request.source_usage_details)
+        if not translation_result.get('translation_success', False):
+            yield _sse_event("error", {"status_code": 500, "detail": f"Translation failed: {translation_result.get('error', 'Unknown error')}"})
+            return
+        yield _sse_event("done", TranslationResponse(**translation_result).model_dump())
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _sse_event(event: str, data: Any) -> bytes:
+    """Encode one Server-Sent Event, taking pre-serialized JSON bytes as is"""
+    payload = data if isinstance(data, bytes) else orjson.dumps(data)
+    return b"event: " + event.encode() + b"\ndata: " + payload + b"\n\n"
+
+@router.post("/cache/clear")
+async def clear_cache(web_scraper: WebScraperService = Depends(get_web_scraper),
+                      pdf_processor: PDFProcessorService = Depends(get_pdf_processor),
+                      llm_service: LLMService = Depends(get_llm_service),
+                      llm_service_gemini: LLMServiceGemini = Depends(get_llm_service_gemini),
+                      pdf_generator: PDFGeneratorService = Depends(get_pdf_generator)):
+    """Drop cached scrape results, PDF extractions and LLM results"""
+    web_scraper.cache.clear()
+    pdf_processor.cache.clear()
+    llm_service.clear_response_cache()
+    llm_service_gemini.clear_response_cache()
+    pdf_generator.clear_response_cache()
+    _article_cache.clear()
+    _quality_cache.clear()
+    logger.info("Source and LLM result caches cleared")
+    return {"status": "cleared"}
+
+# Static body, encoded once; probes get the same prebuilt response every time
+_HEALTH_RESPONSE = Response(
+    content=orjson.dumps({"status": "healthy", "service": "article-generator"}),
+    media_type="application/json"
+)
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "article-generator"}
\ No newline at end of file
+    return _HEALTH_RESPONSE
\ No newline at end of file
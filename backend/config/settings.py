@@ -1,27 +1,103 @@
 import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 
+@dataclass(frozen=True, slots=True)
 class Settings:
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-    GEMINI_API_KEY= os.getenv("GEMINI_API_KEY")
-    TOGETHER_API_KEY = os.getenv("TOGETHER_API_KEY")
-        
+    OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
+    GEMINI_API_KEY: Optional[str] = os.getenv("GEMINI_API_KEY")
+    TOGETHER_API_KEY: Optional[str] = os.getenv("TOGETHER_API_KEY")
+    
+    # Comma-separated CORS origins ("*" for any); leave empty when the frontend is
+    # served same-origin behind the proxy and the CORS middleware is skipped entirely
+    CORS_ALLOW_ORIGINS: tuple = tuple(o.strip() for o in os.getenv("CORS_ALLOW_ORIGINS", "*").split(",") if o.strip())
+    
     # Article generation settings
-    MAX_QUALITY_ITERATIONS = 3
-    QUALITY_THRESHOLD = 0.85
+    MAX_QUALITY_ITERATIONS: int = 3
+    QUALITY_THRESHOLD: float = 0.85
+    # Score the opening of a streamed draft once this many characters have arrived
+    # (0 disables); drafts scoring below threshold minus the margin are abandoned early
+    EARLY_QUALITY_CHECK_CHARS: int = 4000
+    EARLY_QUALITY_REJECT_MARGIN: float = 0.15
+    # Start the next draft while the current one is being evaluated (trades tokens for latency);
+    # it revises against the previous feedback rather than the evaluation still in progress
+    SPECULATIVE_NEXT_DRAFT: bool = False
+    # Stop iterating once a draft scores this much below the best so far, and accept
+    # drafts within the margin of the threshold from the second iteration on
+    QUALITY_PLATEAU_EPSILON: float = 0.01
+    QUALITY_ACCEPT_MARGIN: float = 0.02
+    
+    # Admission control: generations running at once, and how long a request may
+    # wait for a slot before being turned away with 503
+    MAX_CONCURRENT_GENERATIONS: int = 16
+    GENERATION_ADMISSION_TIMEOUT: float = 0.1  # seconds
+    
+    # Threads for blocking LLM SDK calls (tune to provider rate limits)
+    LLM_CONCURRENCY: int = 32
+    
+    # LLM micro-batching settings
+    LLM_BATCH_MAX_SIZE: int = 8
+    # How long a quality batch waits for more evaluations; drafts are dispatched at once
+    LLM_BATCH_MAX_DELAY_MS: int = 50
+    # Score up to this many concurrently submitted drafts in one evaluator call; raises
+    # throughput under load, but each draft then waits for the whole batch verdict. 1 disables.
+    QUALITY_BATCH_MAX_SIZE: int = int(os.getenv("QUALITY_BATCH_MAX_SIZE", "1"))
     
     # Web scraping settings
-    REQUEST_TIMEOUT = 10
-    USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    REQUEST_TIMEOUT: int = 10
+    SCRAPE_MAX_CONCURRENCY: int = 5  # concurrent fetches per multi-URL request
+    USER_AGENT: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    
+    # Source cache settings (scraped URLs and extracted PDFs)
+    SOURCE_CACHE_MAXSIZE: int = 512
+    SOURCE_CACHE_TTL: int = 3600  # seconds
+    
+    # Exact-match cache for finished articles and quality scores
+    LLM_RESULT_CACHE_MAXSIZE: int = 256
+    LLM_RESULT_CACHE_TTL: int = 3600  # seconds
+    # Reuse a first draft generated for a near-identical prompt (cosine similarity of
+    # prompt embeddings above the threshold); 0 disables, as hits skip real generation
+    SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0"))
+    SEMANTIC_CACHE_MAXSIZE: int = 256
+    SEMANTIC_CACHE_EMBEDDING_MODEL: str = "text-embedding-3-small"
+    # Reuse the analysis of a near-identical article (opt-in, e.g. 0.92); 0 disables, as hits
+    # return a critique written for a different article
+    SEMANTIC_ANALYSIS_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_ANALYSIS_CACHE_THRESHOLD", "0"))
+    GEMINI_EMBEDDING_MODEL: str = "text-embedding-004"
+    
+    # Worker processes for CPU-bound PDF decoding/extraction
+    PDF_PROCESS_WORKERS: int = os.cpu_count() or 1
+    
+    # Deferred article analysis results, polled via /api/analysis/{job_id}
+    ANALYSIS_JOB_MAXSIZE: int = 1024
+    ANALYSIS_JOB_TTL: int = 3600  # seconds
     
     # OpenAI settings
-    # OPENAI_MODEL = "ft:gpt-4.1-mini-2025-04-14:codelabdev:jenosize-content:C7LDOFr7"  # Fine-tuned model
-    # OPENAI_MODEL = "gpt-4o-mini"  # Base model (backup)
-    # OPENAI_MODEL = "gpt-4.1-mini"
-    OPENAI_MODEL = "ft:gpt-4.1-mini-2025-04-14:codelabdev:jenosize-content:C7SVORLy"
-    MAX_TOKENS = 8000  # Increased for executive-level content depth
-    TEMPERATURE = 0.7
+    OPENAI_TIMEOUT: float = 120.0  # seconds per request, long enough for full articles
+    OPENAI_CONNECT_TIMEOUT: float = 5.0
+    OPENAI_MAX_RETRIES: int = 2
+    # Client-side pacing below the account's requests/tokens per minute, so bursts wait
+    # briefly instead of hitting 429s and retry backoff; 0 disables. Limits are per process.
+    OPENAI_RPM: int = int(os.getenv("OPENAI_RPM", "0"))
+    OPENAI_TPM: int = int(os.getenv("OPENAI_TPM", "0"))
+    # OPENAI_MODEL: str = "ft:gpt-4.1-mini-2025-04-14:codelabdev:jenosize-content:C7LDOFr7"  # Fine-tuned model
+    # OPENAI_MODEL: str = "gpt-4o-mini"  # Base model (backup)
+    # OPENAI_MODEL: str = "gpt-4.1-mini"
+    OPENAI_MODEL: str = "ft:gpt-4.1-mini-2025-04-14:codelabdev:jenosize-content:C7SVORLy"
+    # Output cap for article generation: 3500 words (the prompt's upper bound) at
+    # ~1.35 tokens/word plus layout and source usage details
+    MAX_TOKENS: int = 6000
+    # Article analysis is a short JSON critique; a small base model is enough for it
+    OPENAI_ANALYSIS_MODEL: str = "gpt-4o-mini"
+    TEMPERATURE: float = 0.7
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Process-wide Settings instance, for FastAPI dependency injection"""
+    return Settings()
 
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
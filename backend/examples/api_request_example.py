@@ -5,68 +5,73 @@ API Request Examples for URL Content Instructions
 Shows how to structure API requests with URL content instructions
 """
 
-import json
+import orjson
 from models.schemas import ArticleRequest, UrlContentInstruction
 
+_PRETTY = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+# Example 1: Single URL with instructions
+REQUEST_1 = {
+    "topic_category": "Digital Transformation",
+    "industry": "Retail",
+    "target_audience": "Retail executives", 
+    "source_urls": ["https://www.mckinsey.com/industries/retail/our-insights/retail-digital-transformation"],
+    "url_instructions": [
+        {
+            "url": "https://www.mckinsey.com/industries/retail/our-insights/retail-digital-transformation",
+            "content_focus": "สถิติการ adopt digital technology ในธุรกิจ retail และ impact ต่อ revenue",
+            "usage_instruction": "ใช้เป็น key statistics ใน introduction เพื่อ establish ความสำคัญของหัวข้อ",
+            "section_target": "introduction",
+            "extraction_type": "statistics"
+        }
+    ],
+    "seo_keywords": "digital transformation retail, retail technology adoption",
+    "custom_prompt": "เขียนบทความเกี่ยวกับ digital transformation ในธุรกิจ retail โดยเน้นที่ practical implementation"
+}
+
+# Example 2: Multiple URLs with different instructions
+REQUEST_2 = {
+    "topic_category": "Artificial Intelligence",
+    "industry": "Healthcare",
+    "target_audience": "Healthcare administrators and IT directors",
+    "source_urls": [
+        "https://www.who.int/news/item/28-06-2023-who-calls-for-safe-and-ethical-ai-for-health", 
+        "https://www.nejm.org/doi/full/10.1056/NEJMra2302726",
+        "https://www.healthcarefinancenews.com/news/ai-healthcare-roi-study"
+    ],
+    "url_instructions": [
+        {
+            "url": "https://www.who.int/news/item/28-06-2023-who-calls-for-safe-and-ethical-ai-for-health",
+            "content_focus": "WHO guidelines และ ethical considerations สำหรับการใช้ AI ใน healthcare",
+            "usage_instruction": "ใช้เป็น regulatory framework ใน section เกี่ยวกับ compliance",
+            "section_target": "regulatory_compliance",
+            "extraction_type": "guidelines"
+        },
+        {
+            "url": "https://www.nejm.org/doi/full/10.1056/NEJMra2302726",
+            "content_focus": "Clinical evidence และ research findings จาก AI implementations",
+            "usage_instruction": "สร้างเป็น evidence-based arguments ใน main content sections",
+            "section_target": "clinical_applications", 
+            "extraction_type": "research_findings"
+        },
+        {
+            "url": "https://www.healthcarefinancenews.com/news/ai-healthcare-roi-study",
+            "content_focus": "ROI data และ cost-benefit analysis ของ AI ใน healthcare",
+            "usage_instruction": "ทำเป็น financial justification table ใน business case section",
+            "section_target": "business_case",
+            "extraction_type": "statistics"
+        }
+    ],
+    "custom_prompt": "สร้างบทความที่ balance ระหว่าง clinical benefits และ business considerations ของ AI ใน healthcare"
+}
+
+# The example requests never change, serialize them once
+_REQUEST_1_JSON = orjson.dumps(REQUEST_1, option=_PRETTY).decode()
+_REQUEST_2_JSON = orjson.dumps(REQUEST_2, option=_PRETTY).decode()
+
 def example_api_request_json():
     """Example of how API request JSON should be structured"""
-    
-    # Example 1: Single URL with instructions
-    request1 = {
-        "topic_category": "Digital Transformation",
-        "industry": "Retail",
-        "target_audience": "Retail executives", 
-        "source_urls": ["https://www.mckinsey.com/industries/retail/our-insights/retail-digital-transformation"],
-        "url_instructions": [
-            {
-                "url": "https://www.mckinsey.com/industries/retail/our-insights/retail-digital-transformation",
-                "content_focus": "สถิติการ adopt digital technology ในธุรกิจ retail และ impact ต่อ revenue",
-                "usage_instruction": "ใช้เป็น key statistics ใน introduction เพื่อ establish ความสำคัญของหัวข้อ",
-                "section_target": "introduction",
-                "extraction_type": "statistics"
-            }
-        ],
-        "seo_keywords": "digital transformation retail, retail technology adoption",
-        "custom_prompt": "เขียนบทความเกี่ยวกับ digital transformation ในธุรกิจ retail โดยเน้นที่ practical implementation"
-    }
-    
-    # Example 2: Multiple URLs with different instructions
-    request2 = {
-        "topic_category": "Artificial Intelligence",
-        "industry": "Healthcare",
-        "target_audience": "Healthcare administrators and IT directors",
-        "source_urls": [
-            "https://www.who.int/news/item/28-06-2023-who-calls-for-safe-and-ethical-ai-for-health", 
-            "https://www.nejm.org/doi/full/10.1056/NEJMra2302726",
-            "https://www.healthcarefinancenews.com/news/ai-healthcare-roi-study"
-        ],
-        "url_instructions": [
-            {
-                "url": "https://www.who.int/news/item/28-06-2023-who-calls-for-safe-and-ethical-ai-for-health",
-                "content_focus": "WHO guidelines และ ethical considerations สำหรับการใช้ AI ใน healthcare",
-                "usage_instruction": "ใช้เป็น regulatory framework ใน section เกี่ยวกับ compliance",
-                "section_target": "regulatory_compliance",
-                "extraction_type": "guidelines"
-            },
-            {
-                "url": "https://www.nejm.org/doi/full/10.1056/NEJMra2302726",
-                "content_focus": "Clinical evidence และ research findings จาก AI implementations",
-                "usage_instruction": "สร้างเป็น evidence-based arguments ใน main content sections",
-                "section_target": "clinical_applications", 
-                "extraction_type": "research_findings"
-            },
-            {
-                "url": "https://www.healthcarefinancenews.com/news/ai-healthcare-roi-study",
-                "content_focus": "ROI data และ cost-benefit analysis ของ AI ใน healthcare",
-                "usage_instruction": "ทำเป็น financial justification table ใน business case section",
-                "section_target": "business_case",
-                "extraction_type": "statistics"
-            }
-        ],
-        "custom_prompt": "สร้างบทความที่ balance ระหว่าง clinical benefits และ business considerations ของ AI ใน healthcare"
-    }
-    
-    return request1, request2
+    return REQUEST_1, REQUEST_2
 
 def example_with_validation():
     """Example showing how to validate the request using Pydantic models"""
@@ -96,10 +101,10 @@ def example_with_validation():
     )
     
     # Convert to dict for API sending
-    request_dict = article_request.dict()
+    request_dict = article_request.model_dump(mode="json")
     
     print("Validated Request Structure:")
-    print(json.dumps(request_dict, indent=2, ensure_ascii=False))
+    print(orjson.dumps(request_dict, option=_PRETTY).decode())
     
     return request_dict
 
@@ -108,18 +113,16 @@ def show_curl_examples():
     
     print("\n=== cURL Command Examples ===\n")
     
-    request1, request2 = example_api_request_json()
-    
     print("1. Single URL with Instructions:")
     print("curl -X POST http://localhost:8000/api/generate \\")
     print("  -H 'Content-Type: application/json' \\")
-    print("  -d '" + json.dumps(request1, ensure_ascii=False) + "'")
+    print("  -d '" + orjson.dumps(REQUEST_1).decode() + "'")
     print()
     
     print("2. Multiple URLs with Different Instructions:")
     print("curl -X POST http://localhost:8000/api/generate \\") 
     print("  -H 'Content-Type: application/json' \\")
-    print("  -d '" + json.dumps(request2, ensure_ascii=False) + "'")
+    print("  -d '" + orjson.dumps(REQUEST_2).decode() + "'")
     print()
 
 def show_expected_response():
@@ -155,20 +158,18 @@ def show_expected_response():
     }
     
     print("Response JSON Structure:")
-    print(json.dumps(expected_response, indent=2, ensure_ascii=False))
+    print(orjson.dumps(expected_response, option=_PRETTY).decode())
 
 if __name__ == "__main__":
     print("=== URL Content Instructions API Examples ===\n")
     
     # Show different request examples
-    request1, request2 = example_api_request_json()
-    
     print("Example 1: Single URL Request")
-    print(json.dumps(request1, indent=2, ensure_ascii=False))
+    print(_REQUEST_1_JSON)
     print("\n" + "="*60 + "\n")
     
     print("Example 2: Multiple URLs Request") 
-    print(json.dumps(request2, indent=2, ensure_ascii=False))
+    print(_REQUEST_2_JSON)
     print("\n" + "="*60 + "\n")
     
     # Show validation
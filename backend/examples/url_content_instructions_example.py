@@ -6,13 +6,13 @@ This shows how users can provide detailed instructions for how to extract
 and use content from specific URLs when generating articles.
 """
 
-from models.schemas import UrlContentInstruction, GenerationContext
-from services.llm_service import LLMService
+from models.schemas import UrlInstruction, GenerationContext
+from services.llm_service import get_llm_service
 
 def example_basic_url_instruction():
     """Basic example: Single URL with content focus"""
     
-    url_instruction = UrlContentInstruction(
+    url_instruction = UrlInstruction(
         url="https://www.mckinsey.com/featured-insights/artificial-intelligence",
         content_focus="เอาสถิติและตัวเลขเกี่ยวกับ AI adoption ในองค์กร",
         usage_instruction="ใช้สถิติเหล่านี้เป็น supporting evidence ในการพูดถึงแนวโน้ม AI",
@@ -39,21 +39,21 @@ def example_multiple_url_instructions():
     """Advanced example: Multiple URLs with different instructions"""
     
     url_instructions = [
-        UrlContentInstruction(
+        UrlInstruction(
             url="https://www.gartner.com/en/newsroom/press-releases/2024-ai-trends",
             content_focus="Gartner's predictions สำหรับ AI trends ในปี 2024-2025",
             usage_instruction="ใช้เป็น main argument ใน section เกี่ยวกับ future outlook",
             section_target="future_trends_section",
             extraction_type="predictions"
         ),
-        UrlContentInstruction(
+        UrlInstruction(
             url="https://hbr.org/2024/01/ai-implementation-case-study",
             content_focus="Case study ของบริษัทที่ implement AI successfully",
             usage_instruction="ยกเป็นตัวอย่าง concrete example และแยกเป็น box/callout",
             section_target="implementation_examples",
             extraction_type="case_study"
         ),
-        UrlContentInstruction(
+        UrlInstruction(
             url="https://www.bcg.com/publications/2024/ai-roi-methodology",
             content_focus="Methodology สำหรับการวัด ROI จาก AI projects",
             usage_instruction="สรุปเป็น step-by-step guide และทำเป็น numbered list",
@@ -122,8 +122,7 @@ def demonstrate_usage():
     print("=== How LLM Service Would Process This ===\n")
     
     # Show how the prompt would be built
-    llm_service = LLMService()
-    user_prompt = llm_service._build_user_prompt(context2, None)
+    user_prompt = get_llm_service()._build_user_prompt(context2, None)
     
     print("Generated User Prompt:")
     print("-" * 50)
@@ -1,34 +1,85 @@
-from fastapi import FastAPI
+import atexit
+import multiprocessing
+import os
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from api.endpoints import article
+from services.web_scraper import create_http_client
+from services.llm_batcher import get_llm_batcher, get_llm_executor, get_quality_batcher
+from services.gemini_client import get_gemini_client
+from services.llm_service_gemini import get_llm_service_gemini
+from config.settings import settings
 import logging
+import logging.handlers
+import orjson
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+# Setup logging (LOG_LEVEL=WARNING in production drops the per-request INFO chatter).
+# Request handlers still format their records (QueueHandler.prepare runs on the calling
+# thread, so mutable args are captured as logged), but only enqueue them; a listener
+# thread does the stream I/O, so concurrent requests don't serialize on the stream lock
+_log_queue = queue.SimpleQueue()
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), handlers=[logging.handlers.QueueHandler(_log_queue)])
+# Records arrive already formatted, so the listener's handler keeps the plain message format
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+# Flush queued records on interpreter exit
+atexit.register(_log_listener.stop)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Every article call needs OpenAI; refuse to start rather than fail per request
+    if not settings.OPENAI_API_KEY:
+        raise RuntimeError("OPENAI_API_KEY is not set")
+    # Shared connection pool for outbound scraping, reused across requests
+    app.state.http_client = create_http_client()
+    # CPU-bound PDF extraction runs outside the GIL; spawn avoids forking a threaded process
+    app.state.process_pool = ProcessPoolExecutor(
+        max_workers=settings.PDF_PROCESS_WORKERS,
+        mp_context=multiprocessing.get_context("spawn")
+    )
+    article.init_services()
+    get_llm_batcher().start()
+    yield
+    await get_llm_batcher().stop()
+    await get_quality_batcher().stop()
+    await app.state.http_client.aclose()
+    # Release the Gemini connection pools; the service is rebuilt with a fresh client on restart
+    gemini_client = get_gemini_client()
+    await gemini_client.aio.aclose()
+    gemini_client.close()
+    get_gemini_client.cache_clear()
+    get_llm_service_gemini.cache_clear()
+    app.state.process_pool.shutdown(cancel_futures=True)
+    # In-flight SDK calls can't be interrupted; drop queued ones and start fresh next time
+    get_llm_executor().shutdown(wait=False, cancel_futures=True)
+    get_llm_executor.cache_clear()
 
 app = FastAPI(
     title="Jenosize Article Generator API",
     description="AI-powered content generation for business trends and future ideas",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=False,  # Must be False when using allow_origins=["*"]
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Configure CORS (skipped entirely for same-origin deployments)
+if settings.CORS_ALLOW_ORIGINS:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=list(settings.CORS_ALLOW_ORIGINS),
+        allow_credentials=False,  # Must be False when using allow_origins=["*"]
+        allow_methods=["GET", "POST", "OPTIONS"],
+        allow_headers=["Content-Type", "Authorization"],
+    )
 
 # Include routers
 app.include_router(article.router, prefix="/api", tags=["articles"])
 
-@app.get("/")
-async def root():
-    logger.info("Root endpoint accessed")
-    return {
+# Static payload, serialized once; no per-hit logging so liveness probes stay cheap
+_ROOT_RESPONSE = Response(
+    content=orjson.dumps({
         "message": "Jenosize Article Generator API",
         "version": "1.0.0",
         "status": "running",
@@ -37,12 +88,27 @@ async def root():
             "health": "/api/health",
             "docs": "/docs"
         }
-    }
+    }),
+    media_type="application/json"
+)
+
+@app.get("/")
+async def root():
+    return _ROOT_RESPONSE
 
-@app.get("/api/health")
-async def health_check():
-    return {"status": "healthy", "service": "jetask-backend"}
+# /api/health is served by the article router
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8003)
\ No newline at end of file
+    # Caches, admission control and deferred analysis jobs are per process, so
+    # extra workers (WEB_CONCURRENCY) only suit deployments with sticky routing
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8003,
+        # "auto" picks uvloop/httptools when installed (not on Windows)
+        loop="auto",
+        http="auto",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        log_level="info"
+    )
\ No newline at end of file
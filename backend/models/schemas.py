@@ -1,5 +1,8 @@
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, HttpUrl
+from dataclasses import dataclass
+from typing import Optional, List, Dict
+from pydantic import BaseModel, ConfigDict, field_validator
+from utils.cache import content_hash
+from utils.helpers import truncate_tokens
 
 class UrlContentInstruction(BaseModel):
     """Instructions for specific URL content extraction and usage"""
@@ -9,6 +12,15 @@ class UrlContentInstruction(BaseModel):
     section_target: Optional[str] = None  # Which section of the article should use this URL's content
     extraction_type: Optional[str] = None  # e.g., "statistics", "case_study", "methodology", "quotes"
 
+@dataclass(slots=True, frozen=True)
+class UrlInstruction:
+    """Validated URL instruction as passed between services (no per-instance pydantic state)"""
+    url: str
+    content_focus: Optional[str] = None
+    usage_instruction: Optional[str] = None
+    section_target: Optional[str] = None
+    extraction_type: Optional[str] = None
+
 class ArticleRequest(BaseModel):
     topic_category: Optional[str] = None
     industry: Optional[str] = None
@@ -21,12 +33,19 @@ class ArticleRequest(BaseModel):
     custom_prompt: Optional[str] = None  # User's custom instructions
     include_thai_translation: Optional[bool] = False  # Whether to generate Thai translation
     selected_model: Optional[str] = 'gpt-finetune'  # Model selection
+    defer_analysis: Optional[bool] = False  # Return before analysis and poll for it separately
+    regenerate: Optional[bool] = False  # Skip cached results and generate a fresh article
+
+# Models below are only built once an article has been generated, so their
+# core schemas are deferred to first use instead of being built at import
 
 class ImageSlot(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     id: str
-    description: str
-    position: str
-    suggested_type: str
+    description: str = "Image placeholder"
+    position: str = "article"
+    suggested_type: str = "photo"
     placement_rationale: Optional[str] = None
     content_guidance: Optional[str] = None
     dimensions: Optional[str] = None
@@ -34,37 +53,123 @@ class ImageSlot(BaseModel):
     alternatives: Optional[str] = None
 
 class ArticleLayout(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     sections: List[str]
     image_slots: List[ImageSlot]
 
 class ArticleAnalysis(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     strengths: List[str]
     weaknesses: List[str] 
     recommendations: List[str]
     summary: str
 
 class ArticleResponse(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     content: str
     layout: ArticleLayout
     quality_score: float
     iterations: int
     source_usage_details: Optional[List[Dict[str, str]]] = None
     analysis: Optional[ArticleAnalysis] = None
+    analysis_job_id: Optional[str] = None  # Set when analysis was deferred; poll /api/analysis/{id}
     thai_content: Optional[str] = None  # Thai translated content
     thai_layout: Optional[ArticleLayout] = None  # Thai translated layout
 
 class QualityFeedback(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     score: float
     feedback: str
     suggestions: List[str]
 
+# Structured output schema for article generation. Strict mode needs every field
+# required and no extra keys, so these mirror the JSON format in the system prompt
+# rather than reusing the more lenient response models above
+
+class ArticleImageSlotOutput(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    
+    id: str
+    description: str
+    position: str
+    suggested_type: str
+    placement_rationale: str
+    content_guidance: str
+    dimensions: str
+    aspect_ratio: str
+    alternatives: str
+
+class ArticleLayoutOutput(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    
+    sections: List[str]
+    image_slots: List[ArticleImageSlotOutput]
+
+class SourceUsageOutput(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    
+    source_title: str
+    source_url: str
+    content_used: str
+    usage_location: str
+    usage_purpose: str
+    transformation: str
+    instruction_compliance: str
+    extraction_type_used: str
+
+class ArticleOutput(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    
+    content: str
+    layout: ArticleLayoutOutput
+    source_usage_details: List[SourceUsageOutput]
+
+class ArticleWithAnalysisOutput(ArticleOutput):
+    """Article plus the model's own critique of it, returned by one fused call"""
+    analysis: ArticleAnalysis
+
+# Token budgets for reference material, applied once when the context is built
+REFERENCE_CONTENT_TOKENS = 600
+SOURCES_TOKEN_BUDGET = 2000  # shared across all scraped sources
+SOURCE_MIN_TOKENS = 200
+# Opening of a generated article sent for analysis
+ANALYSIS_CONTENT_TOKENS = 750
+
 class GenerationContext(BaseModel):
     topic_category: Optional[str] = None
     industry: Optional[str] = None
     target_audience: Optional[str] = None
     scraped_content: Optional[str] = None
     scraped_sources: Optional[List[Dict[str, str]]] = None  # [{"url": "...", "content": "...", "title": "..."}]
-    url_instructions: Optional[List[UrlContentInstruction]] = None  # Detailed instructions for URL content usage
+    url_instructions: Optional[List[UrlInstruction]] = None  # Detailed instructions for URL content usage
     pdf_content: Optional[str] = None
     seo_keywords: List[str] = []
-    custom_prompt: Optional[str] = None
\ No newline at end of file
+    custom_prompt: Optional[str] = None
+    
+    @field_validator("scraped_content", "pdf_content")
+    @classmethod
+    def _truncate_reference(cls, v: Optional[str]) -> Optional[str]:
+        return truncate_tokens(v, REFERENCE_CONTENT_TOKENS) if v else v
+    
+    @field_validator("scraped_sources")
+    @classmethod
+    def _dedupe_and_truncate_sources(cls, v: Optional[List[Dict[str, str]]]) -> Optional[List[Dict[str, str]]]:
+        if not v:
+            return v
+        # Overlapping URL lists repeat sources; drop repeats, keeping the user's order
+        # (it sets the "Source N" numbering that url_instructions refer to)
+        unique = {}
+        for source in v:
+            key = (source.get("url", "").strip().lower(), content_hash(source.get("content", "")))
+            unique.setdefault(key, source)
+        v = list(unique.values())
+        
+        per_source = max(SOURCE_MIN_TOKENS, SOURCES_TOKEN_BUDGET // len(v))
+        return [
+            {**source, "content": truncate_tokens(source["content"], per_source)} if "content" in source else source
+            for source in v
+        ]
@@ -4,6 +4,7 @@ Script to switch between fine-tuned and base models
 """
 
 import os
+import re
 import sys
 import argparse
 from pathlib import Path
@@ -16,74 +17,57 @@ SETTINGS_PATH = Path(__file__).parent.parent / "config" / "settings.py"
 FINE_TUNED_MODEL = "ft:gpt-4.1-mini-2025-04-14:codelabdev:jenosize-content:C7LDOFr7"
 BASE_MODEL = "gpt-4o-mini"
 
-def switch_to_finetuned():
-    """Switch to fine-tuned model"""
+# The active (uncommented) model line in settings.py
+MODEL_LINE_RE = re.compile(r'^(?P<indent>[ \t]*)OPENAI_MODEL: str = "(?P<model>[^"]*)".*$', re.MULTILINE)
+
+def _set_model(model: str, comment: str = "") -> bool:
+    """Point the active OPENAI_MODEL line at model; returns False if settings.py is unchanged"""
     content = SETTINGS_PATH.read_text()
     
-    # Replace base model with fine-tuned model
-    content = content.replace(
-        f'OPENAI_MODEL = "{BASE_MODEL}"', 
-        f'OPENAI_MODEL = "{FINE_TUNED_MODEL}"  # Fine-tuned model'
-    )
-    content = content.replace(
-        f'# OPENAI_MODEL = "{FINE_TUNED_MODEL}"',
-        f'OPENAI_MODEL = "{FINE_TUNED_MODEL}"  # Fine-tuned model'
-    )
-    content = content.replace(
-        f'OPENAI_MODEL = "{FINE_TUNED_MODEL}"',
-        f'OPENAI_MODEL = "{FINE_TUNED_MODEL}"  # Fine-tuned model'
+    new_content = MODEL_LINE_RE.sub(
+        lambda m: f'{m.group("indent")}OPENAI_MODEL: str = "{model}"{comment}',
+        content,
+        count=1
     )
     
-    # Comment out base model
-    if f'OPENAI_MODEL = "{BASE_MODEL}"' in content:
-        content = content.replace(
-            f'OPENAI_MODEL = "{BASE_MODEL}"',
-            f'# OPENAI_MODEL = "{BASE_MODEL}"  # Base model (backup)'
-        )
+    if new_content == content:
+        return False
     
-    SETTINGS_PATH.write_text(content)
+    # Write alongside and rename over, so a concurrent run never sees a half-written file
+    tmp_path = SETTINGS_PATH.with_suffix(".py.tmp")
+    tmp_path.write_text(new_content)
+    os.replace(tmp_path, SETTINGS_PATH)
+    return True
+
+def switch_to_finetuned():
+    """Switch to fine-tuned model"""
+    if not _set_model(FINE_TUNED_MODEL, "  # Fine-tuned model"):
+        print(f"ℹ️  Fine-tuned model already active: {FINE_TUNED_MODEL}")
+        return
     print(f"✅ Switched to fine-tuned model: {FINE_TUNED_MODEL}")
 
 def switch_to_base():
     """Switch to base model"""
-    content = SETTINGS_PATH.read_text()
-    
-    # Replace fine-tuned model with base model
-    content = content.replace(
-        f'OPENAI_MODEL = "{FINE_TUNED_MODEL}"  # Fine-tuned model',
-        f'OPENAI_MODEL = "{BASE_MODEL}"'
-    )
-    content = content.replace(
-        f'OPENAI_MODEL = "{FINE_TUNED_MODEL}"',
-        f'OPENAI_MODEL = "{BASE_MODEL}"'
-    )
-    
-    # Comment out fine-tuned model
-    if f'OPENAI_MODEL = "{BASE_MODEL}"' in content and f'# OPENAI_MODEL = "{FINE_TUNED_MODEL}"' not in content:
-        content = content.replace(
-            f'OPENAI_MODEL = "{BASE_MODEL}"',
-            f'OPENAI_MODEL = "{BASE_MODEL}"\n    # OPENAI_MODEL = "{FINE_TUNED_MODEL}"  # Fine-tuned model (backup)'
-        )
-    
-    SETTINGS_PATH.write_text(content)
+    if not _set_model(BASE_MODEL):
+        print(f"ℹ️  Base model already active: {BASE_MODEL}")
+        return
     print(f"✅ Switched to base model: {BASE_MODEL}")
 
 def show_current():
     """Show current model configuration"""
-    content = SETTINGS_PATH.read_text()
+    match = MODEL_LINE_RE.search(SETTINGS_PATH.read_text())
     
-    for line in content.split('\n'):
-        if 'OPENAI_MODEL = ' in line and not line.strip().startswith('#'):
-            model = line.split('=')[1].strip().strip('"').split('#')[0].strip().strip('"')
-            if model == FINE_TUNED_MODEL:
-                print(f"🎯 Current model: Fine-tuned ({model})")
-            elif model == BASE_MODEL:
-                print(f"🔧 Current model: Base ({model})")
-            else:
-                print(f"❓ Current model: {model}")
-            break
-    else:
+    if match is None:
         print("❌ Could not determine current model")
+        return
+    
+    model = match.group("model")
+    if model == FINE_TUNED_MODEL:
+        print(f"🎯 Current model: Fine-tuned ({model})")
+    elif model == BASE_MODEL:
+        print(f"🔧 Current model: Base ({model})")
+    else:
+        print(f"❓ Current model: {model}")
 
 def compare_models():
     """Compare fine-tuned vs base model capabilities"""
@@ -0,0 +1,22 @@
+from functools import lru_cache
+import httpx
+from google import genai
+from google.genai import types
+from config.settings import settings
+
+@lru_cache(maxsize=1)
+def get_gemini_client() -> genai.Client:
+    """Process-wide Gemini client shared by all services
+    
+    Its connection pools (sync and .aio) are reused across requests; the API key is
+    passed explicitly rather than through the process environment. Over HTTP/2,
+    concurrent calls are multiplexed on one connection instead of each opening its own.
+    """
+    pool_args = {
+        "http2": True,
+        "limits": httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30.0)
+    }
+    return genai.Client(
+        api_key=settings.GEMINI_API_KEY,
+        http_options=types.HttpOptions(client_args=pool_args, async_client_args=pool_args)
+    )
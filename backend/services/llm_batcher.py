@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from config.settings import settings
+from models.schemas import GenerationContext
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+class LLMBatcher:
+    """Micro-batch concurrent generate_article calls.
+
+    Calls already queued are drained together without waiting for more, since
+    drafts can't share a provider call. Identical payloads (same service,
+    context and feedback) share a single LLM call and the remaining ones are
+    dispatched concurrently.
+    """
+
+    def __init__(self, max_batch: int = settings.LLM_BATCH_MAX_SIZE, max_delay_ms: int = 0):
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight = set()
+
+    def start(self) -> None:
+        """Start the consumer task on the running event loop"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the consumer task and fail any calls still queued"""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        while not self._queue.empty():
+            future = self._queue.get_nowait()[-1]
+            if not future.done():
+                future.set_exception(RuntimeError("LLM batcher stopped"))
+
+    async def submit(self, llm_service: Any, context: GenerationContext,
+                     feedback: Optional[str] = None, use_cache: bool = True) -> Dict[str, Any]:
+        """Queue a generate_article call and wait for its result"""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((llm_service, context, feedback, use_cache, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[Any, GenerationContext, Optional[str], bool, asyncio.Future]]) -> None:
+        groups: Dict[Tuple[int, str, Optional[str], bool], List] = {}
+        for llm_service, context, feedback, use_cache, future in batch:
+            key = (id(llm_service), context.model_dump_json(), feedback, use_cache)
+            groups.setdefault(key, [llm_service, context, feedback, use_cache, []])[4].append(future)
+
+        logger.info("Dispatching LLM batch: %d calls, %d unique", len(batch), len(groups))
+        for llm_service, context, feedback, use_cache, futures in groups.values():
+            task = asyncio.create_task(self._call(llm_service, context, feedback, use_cache, futures))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+            for future in futures:
+                future.add_done_callback(partial(self._cancel_if_abandoned, task, futures))
+
+    @staticmethod
+    def _cancel_if_abandoned(task: asyncio.Task, futures: List[asyncio.Future], _: asyncio.Future) -> None:
+        # Every caller was cancelled; stop the underlying call rather than let it run for nobody
+        if all(future.cancelled() for future in futures):
+            task.cancel()
+
+    async def _call(self, llm_service: Any, context: GenerationContext, feedback: Optional[str],
+                    use_cache: bool, futures: List[asyncio.Future]) -> None:
+        stop = threading.Event()
+        try:
+            # Services with a native async client skip the LLM thread pool
+            agenerate = getattr(llm_service, "agenerate_article", None)
+            if agenerate is not None:
+                result = await agenerate(context, feedback, use_cache=use_cache)
+            else:
+                result = await run_llm_call(llm_service.generate_article, context, feedback, stop=stop, use_cache=use_cache)
+        except asyncio.CancelledError:
+            # The worker thread can't be interrupted; it checks the flag between stream chunks
+            stop.set()
+            raise
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future in futures:
+            if not future.done():
+                future.set_result(result)
+
+class QualityBatcher(LLMBatcher):
+    """Micro-batch concurrent quality evaluations into single evaluator calls
+
+    With a max batch of 1, evaluations go straight to the LLM thread pool.
+    """
+
+    def __init__(self, max_batch: int = settings.QUALITY_BATCH_MAX_SIZE,
+                 max_delay_ms: int = settings.LLM_BATCH_MAX_DELAY_MS):
+        super().__init__(max_batch, max_delay_ms)
+
+    async def submit(self, quality_checker: Any, content: str, context: Dict[str, Any]) -> Any:
+        """Queue an evaluate_article_quality call and wait for its QualityFeedback"""
+        if self.max_batch <= 1:
+            return await run_llm_call(quality_checker.evaluate_article_quality, content, context)
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((quality_checker, content, context, future))
+        return await future
+
+    def _dispatch(self, batch: List[Tuple[Any, str, Dict[str, Any], asyncio.Future]]) -> None:
+        logger.info("Dispatching quality batch: %d evaluations", len(batch))
+        task = asyncio.create_task(self._evaluate(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _evaluate(self, batch: List[Tuple[Any, str, Dict[str, Any], asyncio.Future]]) -> None:
+        quality_checker = batch[0][0]
+        futures = [future for _, _, _, future in batch]
+        try:
+            results = await run_llm_call(
+                quality_checker.evaluate_article_quality_batch,
+                [content for _, content, _, _ in batch],
+                [context for _, _, context, _ in batch]
+            )
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
+
+@lru_cache(maxsize=1)
+def get_llm_executor() -> ThreadPoolExecutor:
+    """Process-wide thread pool for blocking LLM SDK calls
+    
+    Sized by LLM_CONCURRENCY so provider calls stay bounded independently of
+    the default executor used for parsing and other short jobs.
+    """
+    return ThreadPoolExecutor(max_workers=settings.LLM_CONCURRENCY, thread_name_prefix="llm")
+
+async def run_llm_call(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking LLM call on the shared LLM thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_llm_executor(), partial(func, *args, **kwargs))
+
+@lru_cache(maxsize=1)
+def get_llm_batcher() -> LLMBatcher:
+    """Process-wide LLMBatcher instance, created on first use"""
+    return LLMBatcher()
+
+@lru_cache(maxsize=1)
+def get_quality_batcher() -> QualityBatcher:
+    """Process-wide QualityBatcher instance, created on first use"""
+    return QualityBatcher()
@@ -1,89 +1,32 @@
-import json
 import logging
-from datetime import datetime
-from typing import Dict, Any, Optional
-from openai import OpenAI
+import threading
+import orjson
+from collections import defaultdict
+from contextlib import closing
+from cachetools import TTLCache
+from functools import lru_cache
+from typing import Dict, Any, Final, Iterator, List, Optional
+from pydantic import ValidationError
+from services.openai_client import get_openai_client
 from config.settings import settings
-from models.schemas import GenerationContext, ArticleResponse, ArticleLayout, ImageSlot
+from models.schemas import ANALYSIS_CONTENT_TOKENS, ArticleOutput, GenerationContext, UrlInstruction
+from utils.cache import SemanticCache, content_hash
+from utils.helpers import count_tokens, current_date_text, truncate_tokens
 
 # Setup logger
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
-class LLMService:
-    def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-    
-    def generate_article(self, context: GenerationContext, feedback: Optional[str] = None) -> Dict[str, Any]:
-        """Generate article content using GPT-4o"""
-        
-        logger.info("Starting article generation with LLM")
-        logger.info(f"Context: topic={context.topic_category}, industry={context.industry}")
-        logger.info(f"Has feedback: {feedback is not None}")
-        
-        system_prompt = self._get_system_prompt()
-        user_prompt = self._build_user_prompt(context, feedback)
-        
-        logger.info(f"System prompt length: {len(system_prompt)}")
-        logger.info(f"User prompt length: {len(user_prompt)}")
-        
-        try:
-            logger.info("Calling OpenAI API for article generation...")
-            response = self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=settings.MAX_TOKENS,
-                temperature=settings.TEMPERATURE,
-                response_format={"type": "json_object"}
-            )
-            
-            logger.info("OpenAI API call successful for article generation")
-            
-            content = response.choices[0].message.content
-            logger.info(f"Response content length: {len(content) if content else 0}")
-            
-            if not content:
-                logger.error("OpenAI returned empty content for article generation")
-                raise Exception("OpenAI returned empty response")
-            
-            logger.info("Parsing JSON response...")
-            result = json.loads(content)
-            logger.info(f"JSON parsed successfully. Keys: {list(result.keys())}")
-            
-            # Extract markdown content and return it directly
-            if 'content' in result and result['content']:
-                markdown_content = result['content']
-                logger.info(f"Extracted markdown content length: {len(markdown_content)}")
-                
-                # Return the markdown content as a string response for frontend
-                return {
-                    'markdown_content': markdown_content,
-                    'layout': result.get('layout', {}),
-                    'source_usage_details': result.get('source_usage_details', [])
-                }
-            else:
-                logger.error("No content found in AI response")
-                raise Exception("AI response missing content field")
-            
-            return result
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error in article generation: {str(e)}")
-            logger.error(f"Raw response: {content[:500]}..." if content else "No content")
-            raise Exception(f"Invalid JSON response from AI: {str(e)}")
-        except Exception as e:
-            logger.error(f"Error in article generation: {str(e)}")
-            logger.error(f"Error type: {type(e).__name__}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            raise Exception(f"Error generating article: {str(e)}")
-    
-    def _get_system_prompt(self) -> str:
-        """Get the system prompt for article generation"""
-        return """You are an expert content creator for Jenosize, a premier digital transformation consultancy. You are writing for C-level executives, business leaders, and decision-makers who need strategic insights to drive business transformation.
+_EMBEDDING_INPUT_CHARS = 16000
+
+# Strict structured output: the model ends exactly when the article object is complete
+_ARTICLE_RESPONSE_FORMAT: Final[Dict[str, Any]] = {
+    "type": "json_schema",
+    "json_schema": {"name": "article", "schema": ArticleOutput.model_json_schema(), "strict": True}
+}
+
+# System prompts are static; keeping them as module constants makes the shared
+# prompt prefix explicit (OpenAI caches identical prefixes automatically)
+_SYSTEM_PROMPT_ARTICLE: Final[str] = """You are an expert content creator for Jenosize, a premier digital transformation consultancy. You are writing for C-level executives, business leaders, and decision-makers who need strategic insights to drive business transformation.
 
 **LANGUAGE SUPPORT**:
 - Accept user inputs in both English and Thai languages
@@ -294,166 +237,410 @@ Before completing your response, ensure:
 - Jenosize's consultative value is clearly positioned throughout
 
 IMPORTANT: You must respond in JSON format only. Return your response as a valid JSON object with the structure specified above."""
+
+_SYSTEM_PROMPT_ANALYSIS: Final[str] = """You are an expert content analyst for Jenosize, a business consultancy. Your task is to analyze generated articles and provide constructive feedback.
+
+ANALYSIS FOCUS:
+- Content quality and business relevance
+- Structure and readability
+- Use of source materials and data
+- Actionability for business leaders
+- Areas for improvement
+
+RESPONSE FORMAT:
+Return a JSON object with:
+{
+  "strengths": ["strength1", "strength2", "strength3"],
+  "weaknesses": ["weakness1", "weakness2"],
+  "recommendations": ["recommendation1", "recommendation2"],
+  "summary": "2-3 sentence overall assessment focusing on pros, cons, and key suggestions"
+}
+
+ANALYSIS GUIDELINES:
+- Be constructive and specific in feedback
+- Focus on business value and practical application
+- Consider the target audience and industry context
+- Evaluate source integration and data usage
+- Suggest concrete improvements
+- Keep summary concise but insightful
+
+IMPORTANT: You must respond in JSON format only."""
+
+# Skeleton of the article user prompt. Stable text comes first and per-request fields
+# after it, so consecutive calls share the longest prefix for OpenAI's automatic prompt
+# caching; feedback differs on every revision and stays at the very end
+_USER_PROMPT_TEMPLATE: Final[str] = (
+    "CURRENT DATE: {current_date}\n"
+    "Please ensure your article reflects current and up-to-date information as of this date.\n\n"
+    "Generate a comprehensive article with the following specifications:\n"
+    "{specs}{scraped}{sources}{instructions}{pdf}{fallback}{feedback}"
+    "\n\nReturn your response as a JSON object with the specified format."
+)
+
+# Message dicts for the static prompts, shared by every request
+_SYSTEM_MESSAGE_ARTICLE: Final[Dict[str, str]] = {"role": "system", "content": _SYSTEM_PROMPT_ARTICLE}
+_SYSTEM_MESSAGE_ANALYSIS: Final[Dict[str, str]] = {"role": "system", "content": _SYSTEM_PROMPT_ANALYSIS}
+
+@lru_cache(maxsize=None)
+def _static_prompt_tokens(prompt: str) -> int:
+    """Token count of a static prompt, tokenized once per process"""
+    return count_tokens(prompt)
+
+class LLMService:
+    def __init__(self):
+        self.client = get_openai_client()
+        # Exact-match cache of raw completion text, keyed on the full request payload.
+        # Methods run on LLM executor threads, hence the lock.
+        self._response_cache = TTLCache(maxsize=settings.LLM_RESULT_CACHE_MAXSIZE, ttl=settings.LLM_RESULT_CACHE_TTL)
+        self._cache_lock = threading.Lock()
+        self._semantic_cache = (
+            SemanticCache(maxsize=settings.SEMANTIC_CACHE_MAXSIZE, threshold=settings.SEMANTIC_CACHE_THRESHOLD)
+            if settings.SEMANTIC_CACHE_THRESHOLD > 0 else None
+        )
     
-    def _build_user_prompt(self, context: GenerationContext, feedback: Optional[str] = None) -> str:
-        """Build the user prompt based on context and feedback"""
+    def generate_article(self, context: GenerationContext, feedback: Optional[str] = None,
+                         stop: Optional[threading.Event] = None, use_cache: bool = True) -> Dict[str, Any]:
+        """Generate article content using GPT-4o
         
-        prompt_parts = []
+        Setting stop abandons the call at the next chunk and closes the stream.
+        """
         
-        if feedback:
-            prompt_parts.append(f"PREVIOUS FEEDBACK TO IMPROVE: {feedback}\n")
+        try:
+            chunks = []
+            with closing(self.generate_article_stream(context, feedback, use_cache)) as stream:
+                for chunk in stream:
+                    if stop is not None and stop.is_set():
+                        break
+                    chunks.append(chunk)
+            if stop is None or not stop.is_set():
+                content = "".join(chunks)
+                logger.info("Response content length: %d", len(content) if content else 0)
+                return self.parse_article_response(content)
+        except Exception as e:
+            logger.exception("Error in article generation (%s): %s", type(e).__name__, e)
+            raise Exception(f"Error generating article: {str(e)}")
+        logger.info("Article generation stopped before completion")
+        raise Exception("Article generation cancelled")
+    
+    def generate_article_stream(self, context: GenerationContext, feedback: Optional[str] = None,
+                                use_cache: bool = True) -> Iterator[str]:
+        """Stream raw response text chunks for article generation
         
-        # Add current date for context
-        current_date = datetime.now().strftime("%B %d, %Y")
-        prompt_parts.append(f"CURRENT DATE: {current_date}")
-        prompt_parts.append("Please ensure your article reflects current and up-to-date information as of this date.\n")
+        An identical earlier request is replayed from the response cache as a single chunk,
+        unless use_cache is False; the fresh response then replaces the cached one.
+        """
         
-        prompt_parts.append("Generate a comprehensive article with the following specifications:\n")
+        logger.info("Starting article generation with LLM")
+        logger.info("Context: topic=%s, industry=%s", context.topic_category, context.industry)
+        logger.info("Has feedback: %s", feedback is not None)
         
-        if context.topic_category:
-            prompt_parts.append(f"Topic Category: {context.topic_category}")
+        user_prompt = self._build_user_prompt(context, feedback)
         
-        if context.industry:
-            prompt_parts.append(f"Industry Focus: {context.industry}")
+        logger.info("System prompt tokens: %d", _static_prompt_tokens(_SYSTEM_PROMPT_ARTICLE))
+        logger.info("User prompt length: %d", len(user_prompt))
         
-        if context.target_audience:
-            prompt_parts.append(f"Target Audience: {context.target_audience}")
+        request = self._build_article_request(user_prompt)
+        key = self._request_key(request)
+        cached = self._get_cached_response(key) if use_cache else None
+        if cached is not None:
+            logger.info("Serving article generation from response cache")
+            yield cached
+            return
         
-        if context.seo_keywords:
-            prompt_parts.append(f"SEO Keywords to incorporate: {', '.join(context.seo_keywords)}")
+        # Revisions carry feedback and must produce a new draft; only first drafts may be reused
+        embedding = self._embed_prompt(user_prompt) if self._semantic_cache is not None and feedback is None else None
+        if embedding is not None and use_cache:
+            similar = self._semantic_cache.lookup(embedding)
+            if similar is not None:
+                logger.info("Serving article generation from semantic cache")
+                yield similar
+                return
+        
+        logger.info("Calling OpenAI API for article generation...")
+        chunks = []
+        # Closing the generator early also closes the HTTP response
+        with self.client.chat.completions.create(**request, stream=True) as stream:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    chunks.append(chunk.choices[0].delta.content)
+                    yield chunks[-1]
         
-        if context.custom_prompt:
-            prompt_parts.append(f"\\nCUSTOM USER INSTRUCTIONS: {context.custom_prompt}")
+        # Only reached when the stream was consumed in full (not abandoned early);
+        # malformed output is not cached so a retry asks the model again
+        content = "".join(chunks)
+        try:
+            orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+        else:
+            self._set_cached_response(key, content)
+            if embedding is not None:
+                self._semantic_cache.add(embedding, content)
+        logger.info("OpenAI API stream completed for article generation")
+    
+    def _build_article_request(self, user_prompt: str) -> Dict[str, Any]:
+        """Chat completion payload for article generation"""
+        return {
+            "model": settings.OPENAI_MODEL,
+            "messages": [
+                _SYSTEM_MESSAGE_ARTICLE,
+                {"role": "user", "content": user_prompt}
+            ],
+            "max_tokens": settings.MAX_TOKENS,
+            "temperature": settings.TEMPERATURE,
+            "response_format": _ARTICLE_RESPONSE_FORMAT
+        }
+    
+    def submit_article_batch(self, contexts: List[GenerationContext]) -> str:
+        """Submit first drafts for many contexts through the OpenAI Batch API
+        
+        For back-office bulk generation: half the price of regular calls, with results
+        arriving within 24 hours. Returns the batch id for get_batch_status and
+        fetch_batch_results; results are keyed by each context's index in the list.
+        """
+        
+        lines = [
+            orjson.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._build_article_request(self._build_user_prompt(context))
+            })
+            for i, context in enumerate(contexts)
+        ]
+        
+        logger.info("Submitting article batch of %d requests", len(lines))
+        batch_file = self.client.files.create(file=("articles.jsonl", b"\n".join(lines)), purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info("Article batch submitted: %s", batch.id)
+        return batch.id
+    
+    def get_batch_status(self, batch_id: str) -> str:
+        """Current status of a submitted batch ("validating", "in_progress", "completed", ...)"""
+        return self.client.batches.retrieve(batch_id).status
+    
+    def fetch_batch_results(self, batch_id: str) -> Dict[int, Dict[str, Any]]:
+        """Parsed articles of a completed batch, keyed by context index
+        
+        Requests that failed map to {"error": "..."} instead of an article.
+        """
+        
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status != "completed":
+            raise Exception(f"Batch {batch_id} is not completed (status: {batch.status})")
+        
+        results: Dict[int, Dict[str, Any]] = {}
+        for file_id in filter(None, (batch.output_file_id, batch.error_file_id)):
+            for line in self.client.files.content(file_id).content.splitlines():
+                if not line.strip():
+                    continue
+                record = orjson.loads(line)
+                index = int(record["custom_id"])
+                response = record.get("response") or {}
+                if record.get("error") or response.get("status_code") != 200:
+                    error = record.get("error") or response.get("body", {}).get("error")
+                    results[index] = {"error": str(error)}
+                    continue
+                try:
+                    results[index] = self.parse_article_response(response["body"]["choices"][0]["message"]["content"])
+                except Exception as e:
+                    results[index] = {"error": str(e)}
+        
+        logger.info("Fetched %d results for article batch %s", len(results), batch_id)
+        return results
+    
+    def _request_key(self, request: Dict[str, Any]) -> str:
+        """Cache key for a chat completion request payload"""
+        return content_hash(orjson.dumps(request, option=orjson.OPT_SORT_KEYS))
+    
+    def _get_cached_response(self, key: str) -> Optional[str]:
+        with self._cache_lock:
+            return self._response_cache.get(key)
+    
+    def _set_cached_response(self, key: str, content: str) -> None:
+        if content:
+            with self._cache_lock:
+                self._response_cache[key] = content
+    
+    def clear_response_cache(self) -> None:
+        """Drop all cached completions"""
+        with self._cache_lock:
+            self._response_cache.clear()
+        if self._semantic_cache is not None:
+            self._semantic_cache.clear()
+    
+    def _embed_prompt(self, user_prompt: str) -> Optional[List[float]]:
+        """Embed a user prompt for the semantic cache; None if embedding fails"""
+        try:
+            # Stay well inside the embedding model's input limit
+            response = self.client.embeddings.create(
+                model=settings.SEMANTIC_CACHE_EMBEDDING_MODEL,
+                input=user_prompt[:_EMBEDDING_INPUT_CHARS]
+            )
+            return response.data[0].embedding
+        except Exception as e:
+            logger.warning("Prompt embedding failed, skipping semantic cache: %s", e)
+            return None
+    
+    def parse_article_response(self, content: str) -> Dict[str, Any]:
+        """Parse the raw JSON response text of an article generation"""
+        
+        if not content:
+            logger.error("OpenAI returned empty content for article generation")
+            raise Exception("OpenAI returned empty response")
+        
+        try:
+            # Parses and validates in one pass; strict structured output guarantees the shape
+            result = ArticleOutput.model_validate_json(content)
+        except ValidationError as e:
+            logger.error("Invalid article response: %s", e)
+            logger.error("Raw response: %s...", content[:500])
+            raise Exception(f"Invalid JSON response from AI: {str(e)}")
+        
+        if not result.content:
+            logger.error("No content found in AI response")
+            raise Exception("AI response missing content field")
+        
+        logger.info("Extracted markdown content length: %d", len(result.content))
+        return {
+            'markdown_content': result.content,
+            'layout': result.layout.model_dump(),
+            'source_usage_details': [detail.model_dump() for detail in result.source_usage_details]
+        }
+    
+    def _build_user_prompt(self, context: GenerationContext, feedback: Optional[str] = None) -> str:
+        """Build the user prompt based on context and feedback"""
+        
+        # Fields left unset expand to nothing; each present block carries its own leading newlines
+        fields = defaultdict(str, current_date=current_date_text())
+        
+        # Specification lines, each present only when its field is set
+        fields["specs"] = "".join("\n" + line for line in filter(None, (
+            context.topic_category and f"Topic Category: {context.topic_category}",
+            context.industry and f"Industry Focus: {context.industry}",
+            context.target_audience and f"Target Audience: {context.target_audience}",
+            context.seo_keywords and f"SEO Keywords to incorporate: {', '.join(context.seo_keywords)}",
+            context.custom_prompt and f"\\nCUSTOM USER INSTRUCTIONS: {context.custom_prompt}"
+        )))
         
         # Handle single source (backward compatibility)
         if context.scraped_content:
-            prompt_parts.append(f"\nReference Content from provided source:\n{context.scraped_content[:2000]}...")
+            fields["scraped"] = f"\n\nReference Content from provided source:\n{context.scraped_content}..."
         
-        # Handle multiple sources
         if context.scraped_sources:
-            prompt_parts.append("\nMultiple Reference Sources:")
-            for i, source in enumerate(context.scraped_sources, 1):
-                title = source.get('title', f'Source {i}')
-                url = source.get('url', 'Unknown URL')
-                content = source.get('content', '')[:1500]  # Limit each source to 1500 chars to fit within token limits
-                
-                prompt_parts.append(f"\nSource {i} - {title}")
-                prompt_parts.append(f"URL: {url}")
-                prompt_parts.append(f"Content: {content}...")
-                
-            prompt_parts.append("\nIMPORTANT: Use the source titles exactly as provided above in your source_mapping response. Distribute content usage across different article sections and clearly map which sections reference which sources.")
+            fields["sources"] = self._format_sources(context.scraped_sources)
         
-        # Handle URL content instructions
         if context.url_instructions:
-            prompt_parts.append("\n=== SPECIFIC URL CONTENT INSTRUCTIONS ===")
-            for i, instruction in enumerate(context.url_instructions, 1):
-                prompt_parts.append(f"\nURL {i} Instructions:")
-                prompt_parts.append(f"- URL: {instruction.url}")
-                
-                if instruction.content_focus:
-                    prompt_parts.append(f"- Content Focus: {instruction.content_focus}")
-                
-                if instruction.usage_instruction:
-                    prompt_parts.append(f"- Usage Instructions: {instruction.usage_instruction}")
-                
-                if instruction.section_target:
-                    prompt_parts.append(f"- Target Section: {instruction.section_target}")
-                
-                if instruction.extraction_type:
-                    prompt_parts.append(f"- Extraction Type: {instruction.extraction_type}")
-            
-            prompt_parts.append("\nIMPORTANT: Follow these URL content instructions precisely. Match the content focus, apply usage instructions as specified, place content in target sections when indicated, and extract the requested type of content. Document your compliance with these instructions in the source_usage_details.")
+            fields["instructions"] = self._format_url_instructions(context.url_instructions)
         
         if context.pdf_content:
-            prompt_parts.append(f"\nReference Content from uploaded document:\n{context.pdf_content[:2000]}...")
+            fields["pdf"] = f"\n\nReference Content from uploaded document:\n{context.pdf_content}..."
         
         if not any([context.topic_category, context.industry, context.scraped_content, context.scraped_sources, context.pdf_content]):
-            prompt_parts.append("Generate an article about emerging business trends and future opportunities.")
+            fields["fallback"] = "\nGenerate an article about emerging business trends and future opportunities."
+        
+        if feedback:
+            fields["feedback"] = f"\n\nPREVIOUS FEEDBACK TO IMPROVE: {feedback}"
+        
+        return _USER_PROMPT_TEMPLATE.format_map(fields)
+    
+    def _format_sources(self, sources: List[Dict[str, str]]) -> str:
+        """Prompt block listing multiple reference sources"""
+        
+        parts = ["\nMultiple Reference Sources:"]
+        for i, source in enumerate(sources, 1):
+            title = source.get('title', f'Source {i}')
+            url = source.get('url', 'Unknown URL')
+            content = source.get('content', '')  # Already capped by GenerationContext to fit within token limits
+            
+            parts.append(f"\nSource {i} - {title}")
+            parts.append(f"URL: {url}")
+            parts.append(f"Content: {content}...")
+        
+        parts.append("\nIMPORTANT: Use the source titles exactly as provided above in your source_mapping response. Distribute content usage across different article sections and clearly map which sections reference which sources.")
+        return "".join("\n" + part for part in parts)
+    
+    def _format_url_instructions(self, instructions: List[UrlInstruction]) -> str:
+        """Prompt block with the user's per-URL content instructions"""
         
-        prompt_parts.append("\nReturn your response as a JSON object with the specified format.")
+        parts = ["\n=== SPECIFIC URL CONTENT INSTRUCTIONS ==="]
+        for i, instruction in enumerate(instructions, 1):
+            parts.append(f"\nURL {i} Instructions:")
+            parts.append(f"- URL: {instruction.url}")
+            
+            if instruction.content_focus:
+                parts.append(f"- Content Focus: {instruction.content_focus}")
+            
+            if instruction.usage_instruction:
+                parts.append(f"- Usage Instructions: {instruction.usage_instruction}")
+            
+            if instruction.section_target:
+                parts.append(f"- Target Section: {instruction.section_target}")
+            
+            if instruction.extraction_type:
+                parts.append(f"- Extraction Type: {instruction.extraction_type}")
         
-        return "\n".join(prompt_parts)
+        parts.append("\nIMPORTANT: Follow these URL content instructions precisely. Match the content focus, apply usage instructions as specified, place content in target sections when indicated, and extract the requested type of content. Document your compliance with these instructions in the source_usage_details.")
+        return "".join("\n" + part for part in parts)
     
     def analyze_article(self, content: str, context: GenerationContext) -> Dict[str, Any]:
         """Generate analysis and feedback for the article"""
         
         logger.info("Starting article analysis with LLM")
         
-        system_prompt = self._get_analysis_system_prompt()
         user_prompt = self._build_analysis_user_prompt(content, context)
         
-        logger.info(f"Analysis system prompt length: {len(system_prompt)}")
-        logger.info(f"Analysis user prompt length: {len(user_prompt)}")
+        logger.info("Analysis system prompt tokens: %d", _static_prompt_tokens(_SYSTEM_PROMPT_ANALYSIS))
+        logger.info("Analysis user prompt length: %d", len(user_prompt))
+        
+        request = {
+            "model": settings.OPENAI_ANALYSIS_MODEL,
+            "messages": [
+                _SYSTEM_MESSAGE_ANALYSIS,
+                {"role": "user", "content": user_prompt}
+            ],
+            "max_tokens": 1000,  # Shorter response for analysis
+            "temperature": 0.3,  # Lower temperature for more consistent analysis
+            "response_format": {"type": "json_object"}
+        }
+        key = self._request_key(request)
         
         try:
-            logger.info("Calling OpenAI API for article analysis...")
-            response = self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=1000,  # Shorter response for analysis
-                temperature=0.3,  # Lower temperature for more consistent analysis
-                response_format={"type": "json_object"}
-            )
-            
-            logger.info("OpenAI API call successful for article analysis")
-            
-            content_response = response.choices[0].message.content
-            logger.info(f"Analysis response content length: {len(content_response) if content_response else 0}")
+            content_response = self._get_cached_response(key)
+            if content_response is not None:
+                logger.info("Serving article analysis from response cache")
+            else:
+                logger.info("Calling OpenAI API for article analysis...")
+                response = self.client.chat.completions.create(**request)
+                
+                logger.info("OpenAI API call successful for article analysis")
+                
+                content_response = response.choices[0].message.content
+                logger.info("Analysis response content length: %d", len(content_response) if content_response else 0)
             
             if not content_response:
                 logger.error("OpenAI returned empty content for article analysis")
                 raise Exception("OpenAI returned empty analysis response")
             
             logger.info("Parsing analysis JSON response...")
-            result = json.loads(content_response)
-            logger.info(f"Analysis JSON parsed successfully. Keys: {list(result.keys())}")
+            result = orjson.loads(content_response)
+            logger.info("Analysis JSON parsed successfully. Keys: %s", list(result.keys()))
             
+            self._set_cached_response(key, content_response)
             return result
             
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error in article analysis: {str(e)}")
-            logger.error(f"Raw response: {content_response[:500]}..." if content_response else "No content")
+        except orjson.JSONDecodeError as e:
+            logger.error("JSON decode error in article analysis: %s", e)
+            logger.error("Raw response: %s...", content_response[:500] if content_response else "No content")
             raise Exception(f"Invalid JSON response from analysis AI: {str(e)}")
         except Exception as e:
-            logger.error(f"Error in article analysis: {str(e)}")
-            logger.error(f"Error type: {type(e).__name__}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Error in article analysis (%s): %s", type(e).__name__, e)
             raise Exception(f"Error analyzing article: {str(e)}")
     
-    def _get_analysis_system_prompt(self) -> str:
-        """Get the system prompt for article analysis"""
-        return """You are an expert content analyst for Jenosize, a business consultancy. Your task is to analyze generated articles and provide constructive feedback.
-
-ANALYSIS FOCUS:
-- Content quality and business relevance
-- Structure and readability
-- Use of source materials and data
-- Actionability for business leaders
-- Areas for improvement
-
-RESPONSE FORMAT:
-Return a JSON object with:
-{
-  "strengths": ["strength1", "strength2", "strength3"],
-  "weaknesses": ["weakness1", "weakness2"],
-  "recommendations": ["recommendation1", "recommendation2"],
-  "summary": "2-3 sentence overall assessment focusing on pros, cons, and key suggestions"
-}
-
-ANALYSIS GUIDELINES:
-- Be constructive and specific in feedback
-- Focus on business value and practical application
-- Consider the target audience and industry context
-- Evaluate source integration and data usage
-- Suggest concrete improvements
-- Keep summary concise but insightful
-
-IMPORTANT: You must respond in JSON format only."""
-    
     def _build_analysis_user_prompt(self, content: str, context: GenerationContext) -> str:
         """Build the user prompt for article analysis"""
         
@@ -468,8 +655,13 @@ IMPORTANT: You must respond in JSON format only."""
             prompt_parts.append(f"SEO Keywords: {', '.join(context.seo_keywords)}")
         
         # Include article content (truncated to fit token limits)
-        prompt_parts.append(f"\\nARTICLE CONTENT:\\n{content[:3000]}...")
+        prompt_parts.append(f"\\nARTICLE CONTENT:\\n{truncate_tokens(content, ANALYSIS_CONTENT_TOKENS)}...")
         
         prompt_parts.append("\\nProvide analysis in the specified JSON format.")
         
-        return "\\n".join(prompt_parts)
\ No newline at end of file
+        return "\\n".join(prompt_parts)
+
+@lru_cache(maxsize=1)
+def get_llm_service() -> LLMService:
+    """Process-wide LLMService instance, created on first use"""
+    return LLMService()
@@ -1,133 +1,41 @@
-import json
 import logging
-from datetime import datetime
-from typing import Dict, Any, Optional
-from google import genai
+import re
+import threading
+from functools import lru_cache
+from cachetools import TTLCache
+from typing import Dict, Any, AsyncIterator, Final, List, Optional, Tuple
 from google.genai import types
 from config.settings import settings
-from models.schemas import GenerationContext, ArticleResponse, ArticleLayout, ImageSlot
+from services.gemini_client import get_gemini_client
+from pydantic import ValidationError
+from models.schemas import ANALYSIS_CONTENT_TOKENS, ArticleAnalysis, ArticleOutput, ArticleWithAnalysisOutput, GenerationContext
+from utils.cache import SemanticCache, content_hash
+from utils.helpers import current_date_text, truncate_tokens
 
 # Setup logger
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
-class LLMServiceGemini:
-    def __init__(self):
-        # Set API key as environment variable for Gemini client
-        import os
-        os.environ['GEMINI_API_KEY'] = settings.GEMINI_API_KEY
-        self.client = genai.Client()
-        self.model_name = "gemini-2.5-pro"
-    
-    def generate_article(self, context: GenerationContext, feedback: Optional[str] = None) -> Dict[str, Any]:
-        """Generate article content using Gemini 2.5 Pro"""
-        
-        logger.info("Starting article generation with Gemini")
-        logger.info(f"Context: topic={context.topic_category}, industry={context.industry}")
-        logger.info(f"Model: {self.model_name}")
-        logger.info(f"Has feedback: {feedback is not None}")
-        
-        system_prompt = self._get_system_prompt()
-        user_prompt = self._build_user_prompt(context, feedback)
-        
-        # Combine system and user prompts for Gemini
-        full_prompt = f"{system_prompt}\n\n{user_prompt}"
-        
-        logger.info(f"Full prompt length: {len(full_prompt)}")
-        
-        try:
-            logger.info("Calling Gemini API for article generation...")
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=full_prompt,
-                config=types.GenerateContentConfig(
-                    temperature=0.7,
-                    max_output_tokens=16000,
-                    thinking_config=types.ThinkingConfig(thinking_budget=-1)
-                    # Remove thinking_config to use default thinking mode
-                )
-            )
-            
-            logger.info("Gemini API call successful for article generation")
-            
-            content = response.text
-            logger.info(f"Response content length: {len(content) if content else 0}")
-            
-            if not content:
-                logger.error("Gemini returned empty content for article generation")
-                raise Exception("Gemini returned empty response")
-            
-            # Extract JSON from response (handle cases where Gemini includes extra text)
-            json_content = None
-            try:
-                # First try direct JSON parsing
-                logger.info("Attempting direct JSON parsing...")
-                json_content = json.loads(content)
-                logger.info("Direct JSON parsing successful")
-            except json.JSONDecodeError:
-                # If direct parsing fails, try to extract JSON from markdown code block
-                logger.info("Direct JSON parsing failed, trying to extract JSON from code block...")
-                
-                # Look for JSON in ```json code blocks
-                import re
-                json_match = re.search(r'```json\s*\n(.*?)\n```', content, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group(1)
-                    logger.info(f"Found JSON in code block, length: {len(json_str)}")
-                    try:
-                        json_content = json.loads(json_str)
-                        logger.info("JSON extracted from code block successfully")
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Failed to parse JSON from code block: {str(e)}")
-                        logger.error(f"JSON string: {json_str[:500]}...")
-                else:
-                    # Try to find any JSON object in the response
-                    json_match = re.search(r'\{.*\}', content, re.DOTALL)
-                    if json_match:
-                        json_str = json_match.group(0)
-                        logger.info(f"Found JSON object in text, length: {len(json_str)}")
-                        try:
-                            json_content = json.loads(json_str)
-                            logger.info("JSON extracted from text successfully")
-                        except json.JSONDecodeError as e:
-                            logger.error(f"Failed to parse JSON from text: {str(e)}")
-                
-            if json_content:
-                logger.info(f"JSON parsed successfully. Keys: {list(json_content.keys())}")
-                
-                # Extract HTML content and return it directly
-                if 'content' in json_content and json_content['content']:
-                    html_content = json_content['content']
-                    logger.info(f"Extracted HTML content length: {len(html_content)}")
-                    
-                    # Return the HTML content as expected by backend
-                    return {
-                        'html_content': html_content,
-                        'layout': json_content.get('layout', {}),
-                        'source_usage_details': json_content.get('source_usage_details', [])
-                    }
-                else:
-                    logger.error("No content found in parsed JSON")
-                    raise Exception("AI response missing content field")
-            else:
-                logger.info("No JSON found, treating entire response as raw HTML content")
-                # If no JSON found, treat the entire response as HTML content
-                return {
-                    'html_content': content,
-                    'layout': {'sections': [], 'image_slots': []},
-                    'source_usage_details': []
-                }
-            
-        except Exception as e:
-            logger.error(f"Error in Gemini article generation: {str(e)}")
-            logger.error(f"Error type: {type(e).__name__}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            raise Exception(f"Error generating article with Gemini: {str(e)}")
-    
-    def _get_system_prompt(self) -> str:
-        """Get the system prompt for article generation"""
-        return """You are an expert content creator for Jenosize, a premier digital transformation consultancy. You are writing for C-level executives, business leaders, and decision-makers who need strategic insights to drive business transformation.
+# The date line changes daily without changing what is asked for; keep it out of cache keys
+_CURRENT_DATE_LINE = re.compile(r"^CURRENT DATE: .*$", re.MULTILINE)
+
+# Output budget for article calls. Gemini counts thinking against max_output_tokens, so
+# thinking gets a fixed budget and the article's share is sized from its target length:
+# the prompt's 2000-3500 words, an explicit "N words" in the custom instructions, or more
+# when they ask for a long-form piece
+_THINKING_BUDGET = 4096
+_ARTICLE_WORDS = 3500
+_LONG_FORM_WORDS = 5000
+_MIN_ARTICLE_WORDS = 300
+_TOKENS_PER_WORD = 1.35
+_HTML_MARKUP_FACTOR = 1.5  # inline-styled semantic HTML around the text
+_ARTICLE_EXTRA_TOKENS = 1500  # layout, image slots and source usage details
+_ANALYSIS_EXTRA_TOKENS = 600  # fused self-critique
+_WORD_COUNT = re.compile(r"(\d{1,2},\d{3}|\d{3,5})\s*words", re.IGNORECASE)
+_LONG_FORM_HINT = re.compile(r"\b(comprehensive|in-depth|in depth|long-form|long form|extensive|exhaustive)\b", re.IGNORECASE)
+
+# Static prompts are sent ahead of every request; as module constants the exact same
+# text leads every call, which Gemini's implicit context caching relies on
+_SYSTEM_PROMPT_ARTICLE: Final[str] = """You are an expert content creator for Jenosize, a premier digital transformation consultancy. You are writing for C-level executives, business leaders, and decision-makers who need strategic insights to drive business transformation.
 
 **LANGUAGE SUPPORT**:
 - Accept user inputs in both English and Thai languages
@@ -342,40 +250,287 @@ Before completing your response, ensure:
 - Content demonstrates deep understanding of business implications
 - Writing tone reflects executive-level sophistication and expertise
 - Jenosize's consultative value is clearly positioned throughout"""
+
+_SYSTEM_PROMPT_ANALYSIS: Final[str] = """You are an expert content analyst for Jenosize, a business consultancy. Your task is to analyze generated articles and provide constructive feedback.
+
+ANALYSIS FOCUS:
+- Content quality and business relevance
+- Structure and readability
+- Use of source materials and data
+- Actionability for business leaders
+- Areas for improvement
+
+RESPONSE FORMAT:
+Return a JSON object with:
+{
+  "strengths": ["strength1", "strength2", "strength3"],
+  "weaknesses": ["weakness1", "weakness2"],
+  "recommendations": ["recommendation1", "recommendation2"],
+  "summary": "2-3 sentence overall assessment focusing on pros, cons, and key suggestions"
+}
+
+ANALYSIS GUIDELINES:
+- Be constructive and specific in feedback
+- Focus on business value and practical application
+- Consider the target audience and industry context
+- Evaluate source integration and data usage
+- Suggest concrete improvements
+- Keep summary concise but insightful
+
+IMPORTANT: Respond in JSON format when possible, or provide structured feedback."""
+
+# Appended to an article prompt so the same call also returns its critique
+_ANALYSIS_REQUEST_SUFFIX: Final[str] = """
+
+Then, in the same JSON, provide "analysis": {"strengths": [...], "weaknesses": [...], "recommendations": [...], "summary": "..."} - a constructive, specific critique of the article you just wrote, judged on business value, structure, source usage and actionability for the target audience, with a 2-3 sentence summary."""
+
+class LLMServiceGemini:
+    def __init__(self):
+        self.client = get_gemini_client()
+        self.model_name = "gemini-2.5-pro"
+        # Analysis is a short structured critique; Flash handles it at a fraction of the cost and latency
+        self.analysis_model_name = "gemini-2.5-flash"
+        # Exact-match cache of raw response text, keyed on model, config and normalized prompt.
+        # The sync methods run on LLM executor threads, hence the lock.
+        self._response_cache = TTLCache(maxsize=settings.LLM_RESULT_CACHE_MAXSIZE, ttl=settings.LLM_RESULT_CACHE_TTL)
+        self._cache_lock = threading.Lock()
+        # Analyses of near-identical articles are reused; drafts (temperature 0.7) never are
+        self._analysis_semantic_cache = (
+            SemanticCache(maxsize=settings.SEMANTIC_CACHE_MAXSIZE, threshold=settings.SEMANTIC_ANALYSIS_CACHE_THRESHOLD)
+            if settings.SEMANTIC_ANALYSIS_CACHE_THRESHOLD > 0 else None
+        )
+    
+    def generate_article(self, context: GenerationContext, feedback: Optional[str] = None, analyze: bool = False,
+                         use_cache: bool = True) -> Dict[str, Any]:
+        """Generate article content using Gemini 2.5 Pro
+        
+        With analyze, the same call also critiques the article, returned under "analysis".
+        Without use_cache, a cached response is never replayed but the fresh one replaces it.
+        """
+        
+        full_prompt, config = self._article_request(context, feedback, analyze)
+        key = self._request_key(full_prompt, config)
+        try:
+            content = self._get_cached_response(key) if use_cache else None
+            if content is not None:
+                logger.info("Serving Gemini article generation from response cache")
+            else:
+                logger.info("Calling Gemini API for article generation...")
+                content = self.client.models.generate_content(model=self.model_name, contents=full_prompt, config=config).text
+                logger.info("Gemini API call successful for article generation")
+            result = self.parse_article_response(content, analyze)
+            self._set_cached_response(key, content)
+            return result
+        except Exception as e:
+            logger.exception("Error in Gemini article generation (%s): %s", type(e).__name__, e)
+            raise Exception(f"Error generating article with Gemini: {str(e)}")
+    
+    async def agenerate_article(self, context: GenerationContext, feedback: Optional[str] = None, analyze: bool = False,
+                                use_cache: bool = True) -> Dict[str, Any]:
+        """Async generate_article on the SDK's native async client, without holding a worker thread"""
+        
+        full_prompt, config = self._article_request(context, feedback, analyze)
+        key = self._request_key(full_prompt, config)
+        try:
+            content = self._get_cached_response(key) if use_cache else None
+            if content is not None:
+                logger.info("Serving Gemini article generation from response cache")
+            else:
+                logger.info("Calling Gemini API for article generation...")
+                content = (await self.client.aio.models.generate_content(model=self.model_name, contents=full_prompt, config=config)).text
+                logger.info("Gemini API call successful for article generation")
+            result = self.parse_article_response(content, analyze)
+            self._set_cached_response(key, content)
+            return result
+        except Exception as e:
+            logger.exception("Error in Gemini article generation (%s): %s", type(e).__name__, e)
+            raise Exception(f"Error generating article with Gemini: {str(e)}")
+    
+    def generate_and_analyze(self, context: GenerationContext, feedback: Optional[str] = None,
+                             use_cache: bool = True) -> Dict[str, Any]:
+        """Generate an article and its analysis in one call, saving the separate analysis round trip"""
+        return self.generate_article(context, feedback, analyze=True, use_cache=use_cache)
+    
+    async def agenerate_and_analyze(self, context: GenerationContext, feedback: Optional[str] = None,
+                                    use_cache: bool = True) -> Dict[str, Any]:
+        """Async generate_and_analyze"""
+        return await self.agenerate_article(context, feedback, analyze=True, use_cache=use_cache)
+    
+    async def agenerate_article_stream(self, context: GenerationContext, feedback: Optional[str] = None,
+                                       use_cache: bool = True) -> AsyncIterator[str]:
+        """Stream raw response text chunks for article generation
+        
+        An identical earlier request is replayed from the response cache as a single chunk,
+        unless use_cache is False.
+        """
+        
+        full_prompt, config = self._article_request(context, feedback)
+        key = self._request_key(full_prompt, config)
+        cached = self._get_cached_response(key) if use_cache else None
+        if cached is not None:
+            logger.info("Serving Gemini article generation from response cache")
+            yield cached
+            return
+        
+        logger.info("Calling Gemini API for streamed article generation...")
+        chunks = []
+        async for chunk in await self.client.aio.models.generate_content_stream(model=self.model_name, contents=full_prompt, config=config):
+            if chunk.text:
+                chunks.append(chunk.text)
+                yield chunks[-1]
+        
+        # Only reached when the stream was consumed in full; unusable output is not cached
+        content = "".join(chunks)
+        try:
+            self.parse_article_response(content)
+        except Exception:
+            pass
+        else:
+            self._set_cached_response(key, content)
+        logger.info("Gemini API stream completed for article generation")
+    
+    def _article_request(self, context: GenerationContext, feedback: Optional[str],
+                         analyze: bool = False) -> Tuple[str, types.GenerateContentConfig]:
+        """Prompt and generation config for an article call, optionally asking for its analysis too"""
+        
+        logger.info("Starting article generation with Gemini")
+        logger.info("Context: topic=%s, industry=%s", context.topic_category, context.industry)
+        logger.info("Model: %s", self.model_name)
+        logger.info("Has feedback: %s", feedback is not None)
+        
+        system_prompt = self._get_system_prompt()
+        user_prompt = self._build_user_prompt(context, feedback)
+        
+        # Combine system and user prompts for Gemini
+        full_prompt = f"{system_prompt}\n\n{user_prompt}"
+        if analyze:
+            full_prompt += _ANALYSIS_REQUEST_SUFFIX
+        
+        logger.info("Full prompt length: %d", len(full_prompt))
+        
+        config = types.GenerateContentConfig(
+            temperature=0.7,
+            max_output_tokens=_THINKING_BUDGET + self._estimate_output_budget(context, analyze),
+            response_mime_type="application/json",
+            response_schema=ArticleWithAnalysisOutput if analyze else ArticleOutput,
+            thinking_config=types.ThinkingConfig(thinking_budget=_THINKING_BUDGET)
+        )
+        return full_prompt, config
+    
+    def _estimate_output_budget(self, context: GenerationContext, analyze: bool = False) -> int:
+        """Tokens the JSON response of an article call needs, excluding thinking"""
+        
+        target_words = _ARTICLE_WORDS
+        if context.custom_prompt:
+            requested = [int(n.replace(",", "")) for n in _WORD_COUNT.findall(context.custom_prompt)]
+            if requested:
+                target_words = max(_MIN_ARTICLE_WORDS, min(max(requested), _LONG_FORM_WORDS))
+            elif _LONG_FORM_HINT.search(context.custom_prompt):
+                target_words = _LONG_FORM_WORDS
+        
+        budget = int(target_words * _TOKENS_PER_WORD * _HTML_MARKUP_FACTOR) + _ARTICLE_EXTRA_TOKENS
+        return budget + _ANALYSIS_EXTRA_TOKENS if analyze else budget
+    
+    def _request_key(self, full_prompt: str, config: types.GenerateContentConfig, model_name: Optional[str] = None) -> str:
+        """Cache key for a generate_content call (on the article model unless given)"""
+        prompt = _CURRENT_DATE_LINE.sub("", full_prompt).strip()
+        return content_hash(f"{model_name or self.model_name}|{config.temperature}|{config.max_output_tokens}|{prompt}")
+    
+    def _get_cached_response(self, key: str) -> Optional[str]:
+        with self._cache_lock:
+            return self._response_cache.get(key)
+    
+    def _set_cached_response(self, key: str, content: str) -> None:
+        if content:
+            with self._cache_lock:
+                self._response_cache[key] = content
+    
+    def clear_response_cache(self) -> None:
+        """Drop all cached responses"""
+        with self._cache_lock:
+            self._response_cache.clear()
+        if self._analysis_semantic_cache is not None:
+            self._analysis_semantic_cache.clear()
+    
+    def _embed_text(self, text: str) -> Optional[List[float]]:
+        """Embed text for the semantic cache; None if embedding fails"""
+        try:
+            response = self.client.models.embed_content(model=settings.GEMINI_EMBEDDING_MODEL, contents=text)
+            return response.embeddings[0].values
+        except Exception as e:
+            logger.warning("Gemini embedding failed, skipping semantic cache: %s", e)
+            return None
+    
+    async def _aembed_text(self, text: str) -> Optional[List[float]]:
+        """Async _embed_text"""
+        try:
+            response = await self.client.aio.models.embed_content(model=settings.GEMINI_EMBEDDING_MODEL, contents=text)
+            return response.embeddings[0].values
+        except Exception as e:
+            logger.warning("Gemini embedding failed, skipping semantic cache: %s", e)
+            return None
+    
+    def parse_article_response(self, content: Optional[str], analyze: bool = False) -> Dict[str, Any]:
+        """Parse the JSON response text of an article generation (with its analysis, if requested)"""
+        
+        logger.info("Response content length: %d", len(content) if content else 0)
+        
+        if not content:
+            logger.error("Gemini returned empty content for article generation")
+            raise Exception("Gemini returned empty response")
+        
+        try:
+            # JSON mode with a response schema guarantees the shape; parse and validate in one pass
+            result = (ArticleWithAnalysisOutput if analyze else ArticleOutput).model_validate_json(content)
+        except ValidationError as e:
+            logger.error("Invalid Gemini article response: %s", e)
+            logger.error("Raw response: %s...", content[:500])
+            raise Exception(f"Invalid JSON response from AI: {str(e)}")
+        
+        if not result.content:
+            logger.error("No content found in parsed JSON")
+            raise Exception("AI response missing content field")
+        
+        logger.info("Extracted HTML content length: %d", len(result.content))
+        parsed = {
+            'html_content': result.content,
+            'layout': result.layout.model_dump(),
+            'source_usage_details': [detail.model_dump() for detail in result.source_usage_details]
+        }
+        if analyze:
+            parsed['analysis'] = result.analysis.model_dump()
+        return parsed
+    
+    def _get_system_prompt(self) -> str:
+        """Get the system prompt for article generation"""
+        return _SYSTEM_PROMPT_ARTICLE
     
     def _build_user_prompt(self, context: GenerationContext, feedback: Optional[str] = None) -> str:
         """Build the user prompt based on context and feedback"""
         
+        # The system prompt and stable text lead and per-request fields follow, so repeat
+        # calls share the longest prefix for Gemini's implicit context caching
         prompt_parts = []
         
-        if feedback:
-            prompt_parts.append(f"PREVIOUS FEEDBACK TO IMPROVE: {feedback}\n")
-        
         # Add current date for context
-        current_date = datetime.now().strftime("%B %d, %Y")
+        current_date = current_date_text()
         prompt_parts.append(f"CURRENT DATE: {current_date}")
         prompt_parts.append("Please ensure your article reflects current and up-to-date information as of this date.\n")
         
         prompt_parts.append("Generate a comprehensive article with the following specifications:\n")
         
-        if context.topic_category:
-            prompt_parts.append(f"Topic Category: {context.topic_category}")
-        
-        if context.industry:
-            prompt_parts.append(f"Industry Focus: {context.industry}")
-        
-        if context.target_audience:
-            prompt_parts.append(f"Target Audience: {context.target_audience}")
-        
-        if context.seo_keywords:
-            prompt_parts.append(f"SEO Keywords to incorporate: {', '.join(context.seo_keywords)}")
-        
-        if context.custom_prompt:
-            prompt_parts.append(f"\\nCUSTOM USER INSTRUCTIONS: {context.custom_prompt}")
+        # Specification lines, each present only when its field is set
+        prompt_parts.extend(filter(None, (
+            context.topic_category and f"Topic Category: {context.topic_category}",
+            context.industry and f"Industry Focus: {context.industry}",
+            context.target_audience and f"Target Audience: {context.target_audience}",
+            context.seo_keywords and f"SEO Keywords to incorporate: {', '.join(context.seo_keywords)}",
+            context.custom_prompt and f"\\nCUSTOM USER INSTRUCTIONS: {context.custom_prompt}"
+        )))
         
         # Handle single source (backward compatibility)
         if context.scraped_content:
-            prompt_parts.append(f"\nReference Content from provided source:\n{context.scraped_content[:2000]}...")
+            prompt_parts.append(f"\nReference Content from provided source:\n{context.scraped_content}...")
         
         # Handle multiple sources
         if context.scraped_sources:
@@ -383,7 +538,7 @@ Before completing your response, ensure:
             for i, source in enumerate(context.scraped_sources, 1):
                 title = source.get('title', f'Source {i}')
                 url = source.get('url', 'Unknown URL')
-                content = source.get('content', '')[:1500]  # Limit each source to 1500 chars to fit within token limits
+                content = source.get('content', '')  # Already capped by GenerationContext to fit within token limits
                 
                 prompt_parts.append(f"\nSource {i} - {title}")
                 prompt_parts.append(f"URL: {url}")
@@ -413,11 +568,15 @@ Before completing your response, ensure:
             prompt_parts.append("\nIMPORTANT: Follow these URL content instructions precisely. Match the content focus, apply usage instructions as specified, place content in target sections when indicated, and extract the requested type of content. Document your compliance with these instructions in the source_usage_details.")
         
         if context.pdf_content:
-            prompt_parts.append(f"\nReference Content from uploaded document:\n{context.pdf_content[:2000]}...")
+            prompt_parts.append(f"\nReference Content from uploaded document:\n{context.pdf_content}...")
         
         if not any([context.topic_category, context.industry, context.scraped_content, context.scraped_sources, context.pdf_content]):
             prompt_parts.append("Generate an article about emerging business trends and future opportunities.")
         
+        # Feedback differs on every revision, keep it at the very end
+        if feedback:
+            prompt_parts.append(f"\nPREVIOUS FEEDBACK TO IMPROVE: {feedback}")
+        
         prompt_parts.append("\nProvide your response as either structured JSON or pure Markdown content.")
         
         return "\n".join(prompt_parts)
@@ -425,6 +584,68 @@ Before completing your response, ensure:
     def analyze_article(self, content: str, context: GenerationContext) -> Dict[str, Any]:
         """Generate analysis and feedback for the article using Gemini"""
         
+        full_prompt, config = self._analysis_request(content, context)
+        key = self._request_key(full_prompt, config, self.analysis_model_name)
+        try:
+            content_response = self._get_cached_response(key)
+            embedding = None
+            if content_response is not None:
+                logger.info("Serving Gemini article analysis from response cache")
+            else:
+                if self._analysis_semantic_cache is not None:
+                    embedding = self._embed_text(self._build_analysis_user_prompt(content, context))
+                    if embedding is not None:
+                        content_response = self._analysis_semantic_cache.lookup(embedding)
+                if content_response is not None:
+                    logger.info("Serving Gemini article analysis from semantic cache")
+                    embedding = None
+                else:
+                    logger.info("Calling Gemini API for article analysis...")
+                    content_response = self.client.models.generate_content(model=self.analysis_model_name, contents=full_prompt, config=config).text
+                    logger.info("Gemini API call successful for article analysis")
+            result = self._parse_analysis_response(content_response)
+            self._set_cached_response(key, content_response)
+            if embedding is not None:
+                self._analysis_semantic_cache.add(embedding, content_response)
+            return result
+        except Exception as e:
+            logger.exception("Error in Gemini article analysis (%s): %s", type(e).__name__, e)
+            return self._fallback_analysis(e)
+    
+    async def aanalyze_article(self, content: str, context: GenerationContext) -> Dict[str, Any]:
+        """Async analyze_article on the SDK's native async client"""
+        
+        full_prompt, config = self._analysis_request(content, context)
+        key = self._request_key(full_prompt, config, self.analysis_model_name)
+        try:
+            content_response = self._get_cached_response(key)
+            embedding = None
+            if content_response is not None:
+                logger.info("Serving Gemini article analysis from response cache")
+            else:
+                if self._analysis_semantic_cache is not None:
+                    embedding = await self._aembed_text(self._build_analysis_user_prompt(content, context))
+                    if embedding is not None:
+                        content_response = self._analysis_semantic_cache.lookup(embedding)
+                if content_response is not None:
+                    logger.info("Serving Gemini article analysis from semantic cache")
+                    embedding = None
+                else:
+                    logger.info("Calling Gemini API for article analysis...")
+                    content_response = (await self.client.aio.models.generate_content(model=self.analysis_model_name, contents=full_prompt, config=config)).text
+                    logger.info("Gemini API call successful for article analysis")
+            result = self._parse_analysis_response(content_response)
+            self._set_cached_response(key, content_response)
+            if embedding is not None:
+                self._analysis_semantic_cache.add(embedding, content_response)
+            return result
+        except Exception as e:
+            logger.exception("Error in Gemini article analysis (%s): %s", type(e).__name__, e)
+            return self._fallback_analysis(e)
+    
+    def _analysis_request(self, content: str, context: GenerationContext) -> Tuple[str, types.GenerateContentConfig]:
+        """Prompt and generation config for an analysis call"""
+        
         logger.info("Starting article analysis with Gemini")
         
         system_prompt = self._get_analysis_system_prompt()
@@ -433,89 +654,45 @@ Before completing your response, ensure:
         # Combine system and user prompts for Gemini
         full_prompt = f"{system_prompt}\n\n{user_prompt}"
         
-        logger.info(f"Analysis full prompt length: {len(full_prompt)}")
+        logger.info("Analysis full prompt length: %d", len(full_prompt))
         
-        try:
-            logger.info("Calling Gemini API for article analysis...")
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=full_prompt,
-                config=types.GenerateContentConfig(
-                    temperature=0.3,
-                    max_output_tokens=1000,
-                    thinking_config=types.ThinkingConfig(thinking_budget=-1)
-                    # Remove thinking_config to use default thinking mode
-                )
-            )
-            
-            logger.info("Gemini API call successful for article analysis")
-            
-            content_response = response.text
-            logger.info(f"Analysis response content length: {len(content_response) if content_response else 0}")
-            
-            if not content_response:
-                logger.error("Gemini returned empty content for article analysis")
-                raise Exception("Gemini returned empty analysis response")
-            
-            # Try to parse as JSON
-            try:
-                logger.info("Parsing analysis JSON response...")
-                result = json.loads(content_response)
-                logger.info(f"Analysis JSON parsed successfully. Keys: {list(result.keys())}")
-                return result
-            except json.JSONDecodeError:
-                # If not JSON, create a basic structure
-                logger.info("Analysis response is not JSON, creating basic structure")
-                return {
-                    "strengths": ["Content generated successfully"],
-                    "weaknesses": ["Analysis could not be parsed as structured feedback"],
-                    "recommendations": ["Review content manually for quality"],
-                    "summary": f"Analysis completed. Raw feedback: {content_response[:200]}..."
-                }
-            
-        except Exception as e:
-            logger.error(f"Error in Gemini article analysis: {str(e)}")
-            logger.error(f"Error type: {type(e).__name__}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            
-            # Fallback analysis
-            return {
-                "strengths": ["Article was generated"],
-                "weaknesses": ["Analysis service temporarily unavailable"],
-                "recommendations": ["Please review the article manually"],
-                "summary": f"Analysis failed due to technical issues: {str(e)}"
-            }
+        config = types.GenerateContentConfig(
+            temperature=0.3,
+            max_output_tokens=1000,
+            response_mime_type="application/json",
+            response_schema=ArticleAnalysis,
+            # No thinking: the schema fixes the shape, and Flash would count thinking
+            # tokens against the 1000-token output cap
+            thinking_config=types.ThinkingConfig(thinking_budget=0)
+        )
+        return full_prompt, config
+    
+    def _parse_analysis_response(self, content_response: Optional[str]) -> Dict[str, Any]:
+        """Parse the JSON response text of an article analysis"""
+        
+        logger.info("Analysis response content length: %d", len(content_response) if content_response else 0)
+        
+        if not content_response:
+            logger.error("Gemini returned empty content for article analysis")
+            raise Exception("Gemini returned empty analysis response")
+        
+        logger.info("Parsing analysis JSON response...")
+        return ArticleAnalysis.model_validate_json(content_response).model_dump()
+    
+    def _fallback_analysis(self, error: Exception) -> Dict[str, Any]:
+        """Placeholder analysis returned when the analysis call fails"""
+        
+        # Fallback analysis
+        return {
+            "strengths": ["Article was generated"],
+            "weaknesses": ["Analysis service temporarily unavailable"],
+            "recommendations": ["Please review the article manually"],
+            "summary": f"Analysis failed due to technical issues: {str(error)}"
+        }
     
     def _get_analysis_system_prompt(self) -> str:
         """Get the system prompt for article analysis"""
-        return """You are an expert content analyst for Jenosize, a business consultancy. Your task is to analyze generated articles and provide constructive feedback.
-
-ANALYSIS FOCUS:
-- Content quality and business relevance
-- Structure and readability
-- Use of source materials and data
-- Actionability for business leaders
-- Areas for improvement
-
-RESPONSE FORMAT:
-Return a JSON object with:
-{
-  "strengths": ["strength1", "strength2", "strength3"],
-  "weaknesses": ["weakness1", "weakness2"],
-  "recommendations": ["recommendation1", "recommendation2"],
-  "summary": "2-3 sentence overall assessment focusing on pros, cons, and key suggestions"
-}
-
-ANALYSIS GUIDELINES:
-- Be constructive and specific in feedback
-- Focus on business value and practical application
-- Consider the target audience and industry context
-- Evaluate source integration and data usage
-- Suggest concrete improvements
-- Keep summary concise but insightful
-
-IMPORTANT: Respond in JSON format when possible, or provide structured feedback."""
+        return _SYSTEM_PROMPT_ANALYSIS
     
     def _build_analysis_user_prompt(self, content: str, context: GenerationContext) -> str:
         """Build the user prompt for article analysis"""
@@ -531,8 +708,13 @@ IMPORTANT: Respond in JSON format when possible, or provide structured feedback.
             prompt_parts.append(f"SEO Keywords: {', '.join(context.seo_keywords)}")
         
         # Include article content (truncated to fit token limits)
-        prompt_parts.append(f"\\nARTICLE CONTENT:\\n{content[:3000]}...")
+        prompt_parts.append(f"\\nARTICLE CONTENT:\\n{truncate_tokens(content, ANALYSIS_CONTENT_TOKENS)}...")
         
         prompt_parts.append("\\nProvide analysis in JSON format with strengths, weaknesses, recommendations, and summary.")
         
-        return "\\n".join(prompt_parts)
\ No newline at end of file
+        return "\\n".join(prompt_parts)
+
+@lru_cache(maxsize=1)
+def get_llm_service_gemini() -> LLMServiceGemini:
+    """Process-wide LLMServiceGemini instance, created on first use"""
+    return LLMServiceGemini()
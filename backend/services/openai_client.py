@@ -0,0 +1,58 @@
+import httpx
+import orjson
+from functools import lru_cache
+from typing import Any, Callable, List
+from openai import DefaultHttpxClient, OpenAI
+from config.settings import settings
+from utils.rate_limit import TokenBucket
+
+# Rough prompt size in tokens from the request body, as OpenAI counts toward TPM
+_BYTES_PER_TOKEN = 4
+
+def _rate_limit_hooks() -> List[Callable[[httpx.Request], None]]:
+    """Request hooks pacing model calls to OPENAI_RPM / OPENAI_TPM
+    
+    Hooks run for every attempt, so SDK retries are paced as well.
+    """
+    hooks = []
+    if settings.OPENAI_RPM > 0:
+        requests_bucket = TokenBucket(settings.OPENAI_RPM)
+        hooks.append(lambda request: requests_bucket.acquire())
+    if settings.OPENAI_TPM > 0:
+        tokens_bucket = TokenBucket(settings.OPENAI_TPM)
+        
+        def acquire_tokens(request: httpx.Request) -> None:
+            # Only JSON model calls count; file uploads for batches are multipart
+            if not request.headers.get("content-type", "").startswith("application/json"):
+                return
+            body = request.read()
+            payload = orjson.loads(body) if body else {}
+            tokens_bucket.acquire(len(body) // _BYTES_PER_TOKEN + (payload.get("max_tokens") or 0))
+        
+        hooks.append(acquire_tokens)
+    return hooks
+
+def cached_prompt_tokens(response: Any) -> int:
+    """Prompt tokens of a chat completion served from OpenAI's prefix cache"""
+    details = getattr(getattr(response, "usage", None), "prompt_tokens_details", None)
+    return getattr(details, "cached_tokens", None) or 0
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> OpenAI:
+    """Process-wide OpenAI client shared by all services
+    
+    One connection pool for every service, with bounded retries and timeouts so a
+    throttled or unreachable API fails fast instead of stalling the quality loop.
+    HTTP/2 multiplexes concurrent calls over few connections, and idle ones are kept
+    long enough to survive the gaps between quality-loop calls.
+    """
+    return OpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        max_retries=settings.OPENAI_MAX_RETRIES,
+        timeout=httpx.Timeout(settings.OPENAI_TIMEOUT, connect=settings.OPENAI_CONNECT_TIMEOUT),
+        http_client=DefaultHttpxClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100, keepalive_expiry=30.0),
+            event_hooks={"request": _rate_limit_hooks()}
+        )
+    )
@@ -1,12 +1,22 @@
-import base64
-import json
 import logging
-from openai import OpenAI
+import orjson
+from functools import lru_cache
 from config.settings import settings
+from services.openai_client import cached_prompt_tokens, get_openai_client
+from utils.cache import ResponseCache
+
+# SIMD base64 codec when available; same API as the stdlib module
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
 
 # Setup logger
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+
+# Routes HTML generation to the same OpenAI prefix cache; the system prompt and then the
+# article lead, so re-rendering an article with different quality info shares its prefix
+_PROMPT_CACHE_KEY = "jenosize-pdf-html"
 
 try:
     import weasyprint
@@ -18,71 +28,91 @@ except ImportError:
 
 class PDFGeneratorService:
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_openai_client()
+        # Re-rendering an unchanged article reuses its HTML instead of calling the model again
+        self._response_cache = ResponseCache(maxsize=settings.LLM_RESULT_CACHE_MAXSIZE, ttl=settings.LLM_RESULT_CACHE_TTL)
     
     def generate_pdf_with_ai(self, content: str, include_quality_info: bool = True, 
-                           quality_score: float = 0.0, iterations: int = 1) -> str:
-        """Generate PDF using AI-enhanced HTML formatting"""
+                           quality_score: float = 0.0, iterations: int = 1, use_cache: bool = True) -> str:
+        """Generate PDF using AI-enhanced HTML formatting, returned base64-encoded"""
         
-        logger.info(f"Starting AI PDF generation for content length: {len(content)}")
-        logger.info(f"Parameters: include_quality_info={include_quality_info}, quality_score={quality_score}, iterations={iterations}")
+        enhanced_html = self.generate_html_with_ai(content, include_quality_info, quality_score, iterations, use_cache)
+        
+        # Return the enhanced HTML as base64 for client-side processing
+        # This allows better control over PDF generation on the frontend
+        logger.info("Converting HTML to base64...")
+        html_base64 = base64.b64encode(enhanced_html.encode('utf-8')).decode('ascii')
+        logger.info("Base64 encoding successful. Length: %d", len(html_base64))
+        
+        return html_base64
+    
+    def generate_html_with_ai(self, content: str, include_quality_info: bool = True,
+                              quality_score: float = 0.0, iterations: int = 1, use_cache: bool = True) -> str:
+        """Generate the AI-enhanced, print-ready HTML document; use_cache=False forces a fresh call"""
+        
+        logger.info("Starting AI PDF generation for content length: %d", len(content))
+        logger.info("Parameters: include_quality_info=%s, quality_score=%s, iterations=%s", include_quality_info, quality_score, iterations)
         
         try:
             # First, get AI-enhanced HTML
             system_prompt = self._get_html_system_prompt()
             user_prompt = self._build_html_user_prompt(content, include_quality_info, quality_score, iterations)
             
-            logger.info(f"System prompt length: {len(system_prompt)}")
-            logger.info(f"User prompt length: {len(user_prompt)}")
+            logger.info("System prompt length: %d", len(system_prompt))
+            logger.info("User prompt length: %d", len(user_prompt))
             
-            logger.info("Calling OpenAI API for HTML generation...")
-            response = self.client.chat.completions.create(
-                model="gpt-4.1-mini",  # Use base model for HTML generation
-                messages=[
+            request = {
+                "model": "gpt-4.1-mini",  # Use base model for HTML generation
+                "messages": [
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
-                max_tokens=4000,  # Reduced tokens for HTML generation
-                temperature=0.1,  # Lower temperature for consistent formatting
-                response_format={"type": "json_object"}
-            )
-            
-            logger.info("OpenAI API call successful")
+                "max_tokens": 4000,  # Reduced tokens for HTML generation
+                "temperature": 0.1,  # Lower temperature for consistent formatting
+                "response_format": {"type": "json_object"},
+                "prompt_cache_key": _PROMPT_CACHE_KEY
+            }
+            key = ResponseCache.key(request)
             
-            response_content = response.choices[0].message.content
-            logger.info(f"Response content length: {len(response_content) if response_content else 0}")
+            response_content = self._response_cache.get(key) if use_cache else None
+            if response_content is not None:
+                logger.info("Serving HTML generation from response cache")
+            else:
+                logger.info("Calling OpenAI API for HTML generation...")
+                response = self.client.chat.completions.create(**request)
+                logger.info("OpenAI API call successful, prompt tokens cached: %d", cached_prompt_tokens(response))
+                response_content = response.choices[0].message.content
+            logger.info("Response content length: %d", len(response_content) if response_content else 0)
             
             if not response_content:
                 raise Exception("OpenAI returned empty response")
             
             logger.info("Parsing JSON response...")
-            result = json.loads(response_content)
-            logger.info(f"JSON parsed successfully. Keys: {list(result.keys())}")
+            result = orjson.loads(response_content)
+            logger.info("JSON parsed successfully. Keys: %s", list(result.keys()))
             
             enhanced_html = result.get("html_content", "")
-            logger.info(f"Enhanced HTML length: {len(enhanced_html)}")
+            logger.info("Enhanced HTML length: %d", len(enhanced_html))
             
             if not enhanced_html:
                 logger.error("AI did not generate HTML content")
                 raise Exception("AI did not generate HTML content")
             
-            # For now, return the enhanced HTML as base64 for client-side processing
-            # This allows better control over PDF generation on the frontend
-            logger.info("Converting HTML to base64...")
-            html_base64 = base64.b64encode(enhanced_html.encode('utf-8')).decode('utf-8')
-            logger.info(f"Base64 encoding successful. Length: {len(html_base64)}")
-            
-            return html_base64
+            self._response_cache.set(key, response_content)
+            return enhanced_html
             
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error: {str(e)}")
-            logger.error(f"Raw response content: {response_content[:500]}...")
+        except orjson.JSONDecodeError as e:
+            logger.error("JSON decode error: %s", e)
+            logger.error("Raw response content: %s...", response_content[:500])
             raise Exception(f"Invalid JSON response from AI: {str(e)}")
         except Exception as e:
-            logger.error(f"Error in AI PDF generation: {str(e)}")
-            logger.error(f"Error type: {type(e).__name__}")
+            logger.exception("Error in AI PDF generation (%s): %s", type(e).__name__, e)
             raise Exception(f"Error generating PDF with AI: {str(e)}")
     
+    def clear_response_cache(self) -> None:
+        """Drop all cached HTML responses"""
+        self._response_cache.clear()
+    
     def _convert_html_to_pdf_weasyprint(self, html_content: str) -> str:
         """Convert HTML to PDF using WeasyPrint"""
         try:
@@ -137,7 +167,8 @@ IMPORTANT:
                              quality_score: float, iterations: int) -> str:
         """Build user prompt for HTML generation"""
         
-        prompt_parts = []
+        # Per-render details follow the article so its text stays in the cached prefix
+        prompt_parts = [f"MARKDOWN CONTENT TO CONVERT:\n{content}"]
         
         if include_quality_info:
             prompt_parts.append(f"""QUALITY INFORMATION:
@@ -147,10 +178,7 @@ IMPORTANT:
 
 Include this information in a professional header section.""")
         
-        prompt_parts.append(f"""MARKDOWN CONTENT TO CONVERT:
-{content}
-
-INSTRUCTIONS:
+        prompt_parts.append("""INSTRUCTIONS:
 1. Convert the above Markdown content to a professional PDF document
 2. Use proper typography and spacing
 3. Handle image placeholders appropriately 
@@ -159,4 +187,9 @@ INSTRUCTIONS:
 
 Return your response as a JSON object with the pdf_base64 field containing the base64 encoded PDF content.""")
         
-        return "\n\n".join(prompt_parts)
\ No newline at end of file
+        return "\n\n".join(prompt_parts)
+
+@lru_cache(maxsize=1)
+def get_pdf_generator() -> PDFGeneratorService:
+    """Process-wide PDFGeneratorService instance, created on first use"""
+    return PDFGeneratorService()
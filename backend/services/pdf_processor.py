@@ -1,54 +1,109 @@
-import base64
+import asyncio
 import io
+import logging
+from concurrent.futures import Executor
+from functools import lru_cache
 from typing import Optional
-from openai import OpenAI
+from services.openai_client import get_openai_client
 from PyPDF2 import PdfReader
 from config.settings import settings
+from services.llm_batcher import run_llm_call
+from utils.cache import AsyncTTLCache, content_hash
+
+# SIMD base64 codec for multi-MB uploads; same API as the stdlib module
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+logger = logging.getLogger(__name__)
+
+def extract_pdf_text(pdf_bytes: bytes) -> str:
+    """Extract the text layer of a PDF
+    
+    CPU-bound and free of service state, so it can run in a worker process.
+    """
+    try:
+        pdf_reader = PdfReader(io.BytesIO(pdf_bytes))
+        
+        text_content = ""
+        for page in pdf_reader.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text_content += page_text + "\n"
+        
+        return text_content
+        
+    except Exception as e:
+        logger.warning("PyPDF2 extraction failed: %s", e)
+        return ""
 
 class PDFProcessorService:
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_openai_client()
+        # Extracted text keyed by hash of the uploaded document
+        self.cache = AsyncTTLCache(maxsize=settings.SOURCE_CACHE_MAXSIZE, ttl=settings.SOURCE_CACHE_TTL)
     
-    def process_pdf_base64(self, pdf_base64: str) -> Optional[str]:
-        """Process PDF from base64 string and extract text"""
+    async def aprocess_pdf_base64(self, pdf_base64: str, executor: Optional[Executor] = None) -> Optional[str]:
+        """Process PDF from base64 string, reusing the result for repeat uploads"""
         try:
-            # Decode base64 to bytes
             pdf_bytes = base64.b64decode(pdf_base64)
+        except Exception as e:
+            raise Exception(f"Error processing PDF: {str(e)}")
+        return await self.aprocess_pdf_bytes(pdf_bytes, executor)
+    
+    async def aprocess_pdf_bytes(self, pdf_bytes: bytes, executor: Optional[Executor] = None) -> Optional[str]:
+        """Process raw PDF bytes, reusing the result for repeat uploads
+        
+        Text extraction runs on the given executor (e.g. a process pool).
+        """
+        return await self.cache.get_or_set(
+            content_hash(pdf_bytes),
+            lambda: self._aprocess_pdf_bytes(pdf_bytes, executor)
+        )
+    
+    async def _aprocess_pdf_bytes(self, pdf_bytes: bytes, executor: Optional[Executor]) -> Optional[str]:
+        try:
+            loop = asyncio.get_running_loop()
+            text_content = await loop.run_in_executor(executor, extract_pdf_text, pdf_bytes)
             
-            # Try PyPDF2 first for text extraction
-            text_content = self._extract_text_with_pypdf2(pdf_bytes)
-            
-            # If PyPDF2 extraction is insufficient, use GPT-4o for OCR
+            # OCR fallback is an LLM call, run it on the LLM thread pool
             if not text_content or len(text_content.strip()) < 100:
-                text_content = self._extract_text_with_gpt4o(pdf_base64)
+                text_content = await run_llm_call(self._extract_text_with_gpt4o, pdf_bytes)
             
             return self._clean_extracted_text(text_content)
             
         except Exception as e:
             raise Exception(f"Error processing PDF: {str(e)}")
     
-    def _extract_text_with_pypdf2(self, pdf_bytes: bytes) -> str:
-        """Extract text using PyPDF2"""
+    def process_pdf_base64(self, pdf_base64: str) -> Optional[str]:
+        """Process PDF from base64 string and extract text"""
+        try:
+            pdf_bytes = base64.b64decode(pdf_base64)
+        except Exception as e:
+            raise Exception(f"Error processing PDF: {str(e)}")
+        return self.process_pdf_bytes(pdf_bytes)
+    
+    def process_pdf_bytes(self, pdf_bytes: bytes) -> Optional[str]:
+        """Process raw PDF bytes and extract text"""
         try:
-            pdf_file = io.BytesIO(pdf_bytes)
-            pdf_reader = PdfReader(pdf_file)
+            # Try PyPDF2 first for text extraction
+            text_content = extract_pdf_text(pdf_bytes)
             
-            text_content = ""
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_content += page_text + "\n"
+            # If PyPDF2 extraction is insufficient, use GPT-4o for OCR
+            if not text_content or len(text_content.strip()) < 100:
+                text_content = self._extract_text_with_gpt4o(pdf_bytes)
             
-            return text_content
+            return self._clean_extracted_text(text_content)
             
         except Exception as e:
-            print(f"PyPDF2 extraction failed: {str(e)}")
-            return ""
+            raise Exception(f"Error processing PDF: {str(e)}")
     
-    def _extract_text_with_gpt4o(self, pdf_base64: str) -> str:
+    def _extract_text_with_gpt4o(self, pdf_bytes: bytes) -> str:
         """Extract text using GPT-4o OCR capabilities"""
         try:
             # Create a data URL for the PDF
+            pdf_base64 = base64.b64encode(pdf_bytes).decode('ascii')
             pdf_data_url = f"data:application/pdf;base64,{pdf_base64}"
             
             response = self.client.chat.completions.create(
@@ -77,7 +132,7 @@ class PDFProcessorService:
             return response.choices[0].message.content
             
         except Exception as e:
-            print(f"GPT-4o OCR extraction failed: {str(e)}")
+            logger.warning("GPT-4o OCR extraction failed: %s", e)
             return ""
     
     def _clean_extracted_text(self, text: str) -> str:
@@ -114,4 +169,9 @@ class PDFProcessorService:
         if len(cleaned_text) > 5000:
             cleaned_text = cleaned_text[:5000] + '...'
         
-        return cleaned_text.strip()
\ No newline at end of file
+        return cleaned_text.strip()
+
+@lru_cache(maxsize=1)
+def get_pdf_processor() -> PDFProcessorService:
+    """Process-wide PDFProcessorService instance, created on first use"""
+    return PDFProcessorService()
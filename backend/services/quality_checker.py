@@ -1,43 +1,115 @@
-import json
-from typing import Dict, Any
-from openai import OpenAI
+import logging
+import orjson
+from functools import lru_cache
+from typing import Dict, Any, List
+from services.openai_client import cached_prompt_tokens, get_openai_client
 from config.settings import settings
 from models.schemas import QualityFeedback
 
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Routes evaluations to the same OpenAI prefix cache; the system prompt leads every call
+# and the article follows, so an early check and the full check of one draft share a prefix
+_PROMPT_CACHE_KEY = "jenosize-quality"
+
 class QualityCheckerService:
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_openai_client()
     
     def evaluate_article_quality(self, article_content: str, context: Dict[str, Any]) -> QualityFeedback:
         """Evaluate article quality and provide feedback"""
         
-        system_prompt = self._get_quality_system_prompt()
         user_prompt = self._build_quality_user_prompt(article_content, context)
+        return self._request_evaluation(user_prompt)
+    
+    def evaluate_incremental(self, partial_content: str, context: Dict[str, Any]) -> QualityFeedback:
+        """Estimate quality from the opening of an article that is still being generated
+        
+        Length and closing criteria can't be judged yet, so the score is only an early signal.
+        """
+        
+        user_prompt = self._build_quality_user_prompt(partial_content, context)
+        user_prompt += (
+            "\n\nNOTE: This is only the opening of an article that is still being generated "
+            "and may be cut off mid-sentence. Do not penalize length, the conclusion or the "
+            "call-to-action; score the quality of what is present."
+        )
+        return self._request_evaluation(user_prompt)
+    
+    def evaluate_article_quality_batch(self, articles: List[str], contexts: List[Dict[str, Any]]) -> List[QualityFeedback]:
+        """Evaluate several articles in one call, returning feedback in input order
+        
+        The system prompt and round trip are paid once for the whole batch; articles
+        missing from the combined verdict are evaluated individually.
+        """
+        
+        if len(articles) == 1:
+            return [self.evaluate_article_quality(articles[0], contexts[0])]
         
+        user_prompt = "\n\n".join([
+            f"Evaluate each of the following {len(articles)} articles independently.",
+            *(
+                f"=== ARTICLE {i} ===\n{self._build_quality_user_prompt(article, context)}"
+                for i, (article, context) in enumerate(zip(articles, contexts), 1)
+            ),
+            'Respond with a JSON object {"results": [...]} holding one evaluation per article, '
+            'each with "id" (the article number) and "score", "feedback" and "suggestions" as specified.'
+        ])
+        
+        verdicts: Dict[int, Dict[str, Any]] = {}
         try:
-            response = self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=1000,
-                temperature=0.2,
-                response_format={"type": "json_object"}
-            )
-            
-            content = response.choices[0].message.content
-            result = json.loads(content)
-            
-            return QualityFeedback(
-                score=result.get("score", 0.0),
-                feedback=result.get("feedback", ""),
-                suggestions=result.get("suggestions", [])
-            )
-            
+            result = self._complete_json(user_prompt, 1000 * len(articles))
+            for item in result.get("results", []):
+                try:
+                    verdicts[int(item["id"])] = item
+                except (KeyError, TypeError, ValueError):
+                    continue
+        except Exception as e:
+            logger.warning("Batched quality evaluation failed, evaluating individually: %s", e)
+        
+        return [
+            self._to_feedback(verdicts[i]) if i in verdicts else self.evaluate_article_quality(article, context)
+            for i, (article, context) in enumerate(zip(articles, contexts), 1)
+        ]
+    
+    def _request_evaluation(self, user_prompt: str) -> QualityFeedback:
+        """Send an evaluation prompt and parse the JSON verdict"""
+        
+        try:
+            return self._to_feedback(self._complete_json(user_prompt, 1000))
         except Exception as e:
             raise Exception(f"Error evaluating article quality: {str(e)}")
     
+    def _complete_json(self, user_prompt: str, max_tokens: int) -> Dict[str, Any]:
+        """Run an evaluation prompt and return the parsed JSON response
+        
+        Verdicts are not cached here; the article endpoints cache them per draft.
+        """
+        
+        system_prompt = self._get_quality_system_prompt()
+        response = self.client.chat.completions.create(
+            model=settings.OPENAI_MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=0.2,
+            response_format={"type": "json_object"},
+            prompt_cache_key=_PROMPT_CACHE_KEY
+        )
+        logger.info("Quality evaluation prompt tokens cached: %d", cached_prompt_tokens(response))
+        return orjson.loads(response.choices[0].message.content)
+    
+    @staticmethod
+    def _to_feedback(result: Dict[str, Any]) -> QualityFeedback:
+        return QualityFeedback(
+            score=result.get("score", 0.0),
+            feedback=result.get("feedback", ""),
+            suggestions=result.get("suggestions", [])
+        )
+    
     def _get_quality_system_prompt(self) -> str:
         """Get system prompt for quality evaluation"""
         return """You are a quality evaluator for Jenosize business articles. Your role is to assess article quality based on specific criteria and provide actionable feedback.
@@ -111,4 +183,9 @@ IMPORTANT: You must respond in JSON format only. Provide a JSON object with the
             "\nReturn your evaluation as a JSON object with the specified format."
         ])
         
-        return "\n".join(prompt_parts)
\ No newline at end of file
+        return "\n".join(prompt_parts)
+
+@lru_cache(maxsize=1)
+def get_quality_checker() -> QualityCheckerService:
+    """Process-wide QualityCheckerService instance, created on first use"""
+    return QualityCheckerService()
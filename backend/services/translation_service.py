@@ -1,19 +1,24 @@
-import json
 import logging
-from typing import Dict, Any, Optional
-from openai import OpenAI
-from config.settings import settings
+import threading
+import orjson
+from contextlib import closing
+from functools import lru_cache
+from typing import Dict, Any, Iterator, Optional
+from services.openai_client import cached_prompt_tokens, get_openai_client
 
 # Setup logger
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+
+# Routes translations to the same OpenAI prefix cache, behind the static system prompt
+_PROMPT_CACHE_KEY = "jenosize-translation"
 
 class TranslationService:
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_openai_client()
     
     def translate_to_thai(self, markdown_content: str, layout_data: Dict = None, 
-                         source_usage_details: list = None) -> Dict[str, Any]:
+                         source_usage_details: list = None, stream: bool = True,
+                         stop: Optional[threading.Event] = None) -> Dict[str, Any]:
         """
         Translate article content from English to Thai
         
@@ -21,54 +26,94 @@ class TranslationService:
             markdown_content: English markdown content
             layout_data: Article layout information
             source_usage_details: Source usage information
+            stream: Receive the response incrementally, so a long translation is bounded by
+                the per-read timeout rather than the whole-request one; False waits for it in one piece
+            stop: When set, a streamed translation is abandoned at the next chunk and its stream closed
             
         Returns:
             Dict containing translated content and preserved layout
         """
         
-        logger.info(f"Starting translation to Thai for content length: {len(markdown_content)}")
+        logger.info("Starting translation to Thai for content length: %d", len(markdown_content))
         
         if not markdown_content or not markdown_content.strip():
             logger.warning("Empty content provided for translation")
-            return {
-                'markdown_content': '',
-                'layout': layout_data or {},
-                'source_usage_details': source_usage_details or [],
-                'translation_success': False,
-                'error': 'Empty content'
-            }
+            return self._failed_translation(layout_data, source_usage_details, 'Empty content')
+        
+        try:
+            if stream:
+                chunks = []
+                with closing(self.translate_to_thai_stream(markdown_content, layout_data, source_usage_details)) as response_stream:
+                    for chunk in response_stream:
+                        if stop is not None and stop.is_set():
+                            logger.info("Thai translation stopped before completion")
+                            return self._failed_translation(layout_data, source_usage_details, 'Translation cancelled')
+                        chunks.append(chunk)
+                response_content = "".join(chunks)
+            else:
+                logger.info("Calling OpenAI API for Thai translation...")
+                response = self.client.chat.completions.create(
+                    **self._build_translation_request(markdown_content, layout_data, source_usage_details)
+                )
+                logger.info("OpenAI API call successful for translation, prompt tokens cached: %d", cached_prompt_tokens(response))
+                response_content = response.choices[0].message.content
+        except Exception as e:
+            logger.exception("Error in Thai translation (%s): %s", type(e).__name__, e)
+            return self._failed_translation(layout_data, source_usage_details, f'Translation failed: {str(e)}')
+        
+        return self.parse_translation_response(response_content, layout_data, source_usage_details)
+    
+    def translate_to_thai_stream(self, markdown_content: str, layout_data: Dict = None,
+                                 source_usage_details: list = None) -> Iterator[str]:
+        """Stream raw response text chunks of a translation, for parse_translation_response"""
+        
+        logger.info("Calling OpenAI API for streamed Thai translation...")
+        # Closing the generator early also closes the HTTP response
+        with self.client.chat.completions.create(
+            **self._build_translation_request(markdown_content, layout_data, source_usage_details),
+            stream=True,
+            stream_options={"include_usage": True}
+        ) as stream:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                elif chunk.usage is not None:
+                    # The final chunk carries only usage
+                    logger.info("Translation prompt tokens cached: %d", cached_prompt_tokens(chunk))
+        logger.info("OpenAI API stream completed for translation")
+    
+    def _build_translation_request(self, markdown_content: str, layout_data: Dict = None,
+                                   source_usage_details: list = None) -> Dict[str, Any]:
+        """Chat completion payload for a translation"""
+        return {
+            "model": "gpt-4.1-mini",  # Use GPT-4o for better Thai translation
+            "messages": [
+                {"role": "system", "content": self._get_translation_system_prompt()},
+                {"role": "user", "content": self._build_translation_user_prompt(markdown_content, layout_data, source_usage_details)}
+            ],
+            "max_tokens": 8000,  # Sufficient for long articles
+            "temperature": 0.2,  # Low temperature for consistent translation
+            "response_format": {"type": "json_object"},
+            "prompt_cache_key": _PROMPT_CACHE_KEY
+        }
+    
+    def parse_translation_response(self, response_content: Optional[str], layout_data: Dict = None,
+                                   source_usage_details: list = None) -> Dict[str, Any]:
+        """Parse the JSON response text of a translation into the translate_to_thai result"""
+        
+        logger.info("Translation response length: %d", len(response_content) if response_content else 0)
         
         try:
-            system_prompt = self._get_translation_system_prompt()
-            user_prompt = self._build_translation_user_prompt(markdown_content, layout_data, source_usage_details)
-            
-            logger.info("Calling OpenAI API for Thai translation...")
-            response = self.client.chat.completions.create(
-                model="gpt-4.1-mini",  # Use GPT-4o for better Thai translation
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=8000,  # Sufficient for long articles
-                temperature=0.2,  # Low temperature for consistent translation
-                response_format={"type": "json_object"}
-            )
-            
-            logger.info("OpenAI API call successful for translation")
-            
-            response_content = response.choices[0].message.content
-            logger.info(f"Translation response length: {len(response_content) if response_content else 0}")
-            
             if not response_content:
                 logger.error("OpenAI returned empty content for translation")
                 raise Exception("OpenAI returned empty translation response")
             
             logger.info("Parsing translation JSON response...")
-            result = json.loads(response_content)
-            logger.info(f"Translation JSON parsed successfully. Keys: {list(result.keys())}")
+            result = orjson.loads(response_content)
+            logger.info("Translation JSON parsed successfully. Keys: %s", list(result.keys()))
             
             thai_content = result.get("thai_content", "")
-            logger.info(f"Thai content length: {len(thai_content)}")
+            logger.info("Thai content length: %d", len(thai_content))
             
             return {
                 'markdown_content': thai_content,
@@ -78,26 +123,23 @@ class TranslationService:
                 'translation_notes': result.get('translation_notes', [])
             }
             
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error in translation: {str(e)}")
-            logger.error(f"Raw response content: {response_content[:500]}..." if response_content else "No content")
-            return {
-                'markdown_content': '',
-                'layout': layout_data or {},
-                'source_usage_details': source_usage_details or [],
-                'translation_success': False,
-                'error': f'Invalid JSON response: {str(e)}'
-            }
+        except orjson.JSONDecodeError as e:
+            logger.error("JSON decode error in translation: %s", e)
+            logger.error("Raw response content: %s...", response_content[:500])
+            return self._failed_translation(layout_data, source_usage_details, f'Invalid JSON response: {str(e)}')
         except Exception as e:
-            logger.error(f"Error in Thai translation: {str(e)}")
-            logger.error(f"Error type: {type(e).__name__}")
-            return {
-                'markdown_content': '',
-                'layout': layout_data or {},
-                'source_usage_details': source_usage_details or [],
-                'translation_success': False,
-                'error': f'Translation failed: {str(e)}'
-            }
+            logger.exception("Error in Thai translation (%s): %s", type(e).__name__, e)
+            return self._failed_translation(layout_data, source_usage_details, f'Translation failed: {str(e)}')
+    
+    def _failed_translation(self, layout_data: Dict, source_usage_details: list, error: str) -> Dict[str, Any]:
+        """translate_to_thai result for a translation that did not succeed"""
+        return {
+            'markdown_content': '',
+            'layout': layout_data or {},
+            'source_usage_details': source_usage_details or [],
+            'translation_success': False,
+            'error': error
+        }
     
     def _get_translation_system_prompt(self) -> str:
         """Get system prompt for Thai translation"""
@@ -189,14 +231,14 @@ IMPORTANT:
             prompt_parts.extend([
                 "",
                 "LAYOUT DATA TO PRESERVE AND TRANSLATE:",
-                json.dumps(layout_data, indent=2, ensure_ascii=False)
+                orjson.dumps(layout_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
             ])
         
         if source_usage_details:
             prompt_parts.extend([
                 "",
                 "SOURCE USAGE DETAILS TO TRANSLATE:",
-                json.dumps(source_usage_details, indent=2, ensure_ascii=False)
+                orjson.dumps(source_usage_details, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
             ])
         
         prompt_parts.extend([
@@ -212,4 +254,9 @@ IMPORTANT:
             "Return the complete translation in the specified JSON format."
         ])
         
-        return "\n".join(prompt_parts)
\ No newline at end of file
+        return "\n".join(prompt_parts)
+
+@lru_cache(maxsize=1)
+def get_translation_service() -> TranslationService:
+    """Process-wide TranslationService instance, created on first use"""
+    return TranslationService()
@@ -1,14 +1,27 @@
 import requests
+import httpx
+import asyncio
 from bs4 import BeautifulSoup
+from functools import lru_cache
 from typing import Optional, List, Dict
 from config.settings import settings
+from utils.cache import AsyncTTLCache
 import re
 import logging
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 
 # Setup logger
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create the pooled async HTTP client shared by all scrape calls"""
+    return httpx.AsyncClient(
+        headers={'User-Agent': settings.USER_AGENT},
+        timeout=settings.REQUEST_TIMEOUT,
+        follow_redirects=True,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+    )
 
 class WebScraperService:
     def __init__(self):
@@ -16,16 +29,18 @@ class WebScraperService:
         self.session.headers.update({
             'User-Agent': settings.USER_AGENT
         })
+        # Scraped results keyed by URL, shared across requests
+        self.cache = AsyncTTLCache(maxsize=settings.SOURCE_CACHE_MAXSIZE, ttl=settings.SOURCE_CACHE_TTL)
     
     def scrape_url(self, url: str) -> Optional[str]:
         """Scrape content from a given URL"""
-        logger.info(f"Starting to scrape URL: {url}")
+        logger.info("Starting to scrape URL: %s", url)
         
         try:
             # Validate URL
             logger.info("Validating URL format...")
             if not self._is_valid_url(url):
-                logger.error(f"Invalid URL format: {url}")
+                logger.error("Invalid URL format: %s", url)
                 raise ValueError("Invalid URL format")
             
             logger.info("URL format valid, making HTTP request...")
@@ -34,13 +49,13 @@ class WebScraperService:
                 timeout=settings.REQUEST_TIMEOUT,
                 allow_redirects=True
             )
-            logger.info(f"HTTP response status: {response.status_code}")
+            logger.info("HTTP response status: %s", response.status_code)
             response.raise_for_status()
             
             # Parse HTML content
             logger.info("Parsing HTML content...")
             soup = BeautifulSoup(response.content, 'html.parser')
-            logger.info(f"HTML parsed successfully, content length: {len(response.content)}")
+            logger.info("HTML parsed successfully, content length: %d", len(response.content))
             
             # Remove unwanted elements
             logger.info("Removing unwanted HTML elements...")
@@ -49,23 +64,20 @@ class WebScraperService:
             # Extract main content
             logger.info("Extracting main content...")
             content = self._extract_main_content(soup)
-            logger.info(f"Extracted content length: {len(content)}")
+            logger.info("Extracted content length: %d", len(content))
             
             # Clean and format text
             logger.info("Cleaning and formatting text...")
             cleaned_content = self._clean_text(content)
-            logger.info(f"Cleaned content length: {len(cleaned_content)}")
+            logger.info("Cleaned content length: %d", len(cleaned_content))
             
             return cleaned_content
             
         except requests.RequestException as e:
-            logger.error(f"Network error fetching URL {url}: {str(e)}")
+            logger.error("Network error fetching URL %s: %s", url, e)
             raise Exception(f"Error fetching URL: {str(e)}")
         except Exception as e:
-            logger.error(f"Error processing content from {url}: {str(e)}")
-            logger.error(f"Error type: {type(e).__name__}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Error processing content from %s (%s): %s", url, type(e).__name__, e)
             raise Exception(f"Error processing content: {str(e)}")
     
     def _is_valid_url(self, url: str) -> bool:
@@ -157,13 +169,13 @@ class WebScraperService:
     
     def scrape_url_with_metadata(self, url: str) -> Optional[Dict[str, str]]:
         """Scrape content from a URL and return with metadata"""
-        logger.info(f"Starting to scrape URL with metadata: {url}")
+        logger.info("Starting to scrape URL with metadata: %s", url)
         
         try:
             # Validate URL
             logger.info("Validating URL format...")
             if not self._is_valid_url(url):
-                logger.error(f"Invalid URL format: {url}")
+                logger.error("Invalid URL format: %s", url)
                 raise ValueError("Invalid URL format")
             
             logger.info("URL format valid, making HTTP request...")
@@ -172,70 +184,138 @@ class WebScraperService:
                 timeout=settings.REQUEST_TIMEOUT,
                 allow_redirects=True
             )
-            logger.info(f"HTTP response status: {response.status_code}")
+            logger.info("HTTP response status: %s", response.status_code)
             response.raise_for_status()
             
-            # Parse HTML content
-            logger.info("Parsing HTML content...")
-            soup = BeautifulSoup(response.content, 'html.parser')
-            logger.info(f"HTML parsed successfully, content length: {len(response.content)}")
-            
-            # Extract title
-            title = self._extract_title(soup)
-            logger.info(f"Extracted title: {title}")
-            
-            # Remove unwanted elements
-            logger.info("Removing unwanted HTML elements...")
-            self._remove_unwanted_elements(soup)
+            return self._parse_with_metadata(url, response.content)
             
-            # Extract main content
-            logger.info("Extracting main content...")
-            content = self._extract_main_content(soup)
-            logger.info(f"Extracted content length: {len(content)}")
+        except requests.RequestException as e:
+            logger.error("Network error fetching URL %s: %s", url, e)
+            raise Exception(f"Error fetching URL: {str(e)}")
+        except Exception as e:
+            logger.exception("Error processing content from %s (%s): %s", url, type(e).__name__, e)
+            raise Exception(f"Error processing content: {str(e)}")
+    
+    async def ascrape_url_with_metadata(self, url: str, client: httpx.AsyncClient) -> Optional[Dict[str, str]]:
+        """Async variant of scrape_url_with_metadata using a shared pooled client"""
+        return await self.cache.get_or_set(url, lambda: self._afetch_url_with_metadata(url, client))
+    
+    async def _afetch_url_with_metadata(self, url: str, client: httpx.AsyncClient) -> Optional[Dict[str, str]]:
+        """Fetch and parse a URL, bypassing the cache"""
+        logger.info("Starting to scrape URL with metadata: %s", url)
+        
+        try:
+            if not self._is_valid_url(url):
+                logger.error("Invalid URL format: %s", url)
+                raise ValueError("Invalid URL format")
             
-            # Clean and format text
-            logger.info("Cleaning and formatting text...")
-            cleaned_content = self._clean_text(content)
-            logger.info(f"Cleaned content length: {len(cleaned_content)}")
+            response = await client.get(url)
+            logger.info("HTTP response status: %s", response.status_code)
+            response.raise_for_status()
             
-            return {
-                "url": url,
-                "title": title,
-                "content": cleaned_content
-            }
+            # BeautifulSoup parsing is CPU-bound, keep it off the event loop
+            return await asyncio.to_thread(self._parse_with_metadata, url, response.content)
             
-        except requests.RequestException as e:
-            logger.error(f"Network error fetching URL {url}: {str(e)}")
+        except httpx.HTTPError as e:
+            logger.error("Network error fetching URL %s: %s", url, e)
             raise Exception(f"Error fetching URL: {str(e)}")
         except Exception as e:
-            logger.error(f"Error processing content from {url}: {str(e)}")
-            logger.error(f"Error type: {type(e).__name__}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Error processing content from %s (%s): %s", url, type(e).__name__, e)
             raise Exception(f"Error processing content: {str(e)}")
     
+    def _parse_with_metadata(self, url: str, html: bytes) -> Dict[str, str]:
+        """Parse fetched HTML into title and cleaned main content"""
+        
+        # Parse HTML content
+        logger.info("Parsing HTML content...")
+        soup = BeautifulSoup(html, 'html.parser')
+        logger.info("HTML parsed successfully, content length: %d", len(html))
+        
+        # Extract title
+        title = self._extract_title(soup)
+        logger.info("Extracted title: %s", title)
+        
+        # Remove unwanted elements
+        logger.info("Removing unwanted HTML elements...")
+        self._remove_unwanted_elements(soup)
+        
+        # Extract main content
+        logger.info("Extracting main content...")
+        content = self._extract_main_content(soup)
+        logger.info("Extracted content length: %d", len(content))
+        
+        # Clean and format text
+        logger.info("Cleaning and formatting text...")
+        cleaned_content = self._clean_text(content)
+        logger.info("Cleaned content length: %d", len(cleaned_content))
+        
+        return {
+            "url": url,
+            "title": title,
+            "content": cleaned_content
+        }
+    
     def scrape_multiple_urls(self, urls: List[str], max_urls: int = 5) -> List[Dict[str, str]]:
         """Scrape multiple URLs with metadata"""
-        logger.info(f"Starting to scrape {len(urls)} URLs (max: {max_urls})")
+        logger.info("Starting to scrape %d URLs (max: %s)", len(urls), max_urls)
         
         # Limit to max_urls
         urls_to_process = urls[:max_urls]
-        logger.info(f"Processing {len(urls_to_process)} URLs")
+        logger.info("Processing %d URLs", len(urls_to_process))
         
         results = []
         for i, url in enumerate(urls_to_process, 1):
             try:
-                logger.info(f"Processing URL {i}/{len(urls_to_process)}: {url}")
+                logger.info("Processing URL %s/%d: %s", i, len(urls_to_process), url)
                 result = self.scrape_url_with_metadata(url)
                 if result:
                     results.append(result)
-                    logger.info(f"Successfully scraped URL {i}: {result['title']}")
+                    logger.info("Successfully scraped URL %s: %s", i, result['title'])
             except Exception as e:
-                logger.error(f"Failed to scrape URL {i} ({url}): {str(e)}")
+                logger.error("Failed to scrape URL %s (%s): %s", i, url, e)
+                # Continue with other URLs even if one fails
+                continue
+        
+        logger.info("Successfully scraped %d out of %d URLs", len(results), len(urls_to_process))
+        return results
+    
+    async def ascrape_many(self, urls: List[str], client: httpx.AsyncClient, max_urls: int = 5,
+                           max_concurrency: int = settings.SCRAPE_MAX_CONCURRENCY) -> List[Dict[str, str]]:
+        """Scrape multiple URLs concurrently over a shared pooled client
+        
+        At most max_concurrency fetches are in flight at once. Individual failures
+        are skipped; if every URL fails, an exception listing them is raised.
+        """
+        urls_to_process = urls[:max_urls]
+        logger.info("Starting to scrape %d URLs concurrently", len(urls_to_process))
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def scrape_one(url: str) -> Dict[str, str]:
+            async with semaphore:
+                return await self.ascrape_url_with_metadata(url, client)
+        
+        scraped = await asyncio.gather(
+            *(scrape_one(url) for url in urls_to_process),
+            return_exceptions=True
+        )
+        
+        results = []
+        failed_urls = []
+        for i, (url, result) in enumerate(zip(urls_to_process, scraped), 1):
+            if isinstance(result, Exception):
+                logger.error("Failed to scrape URL %s (%s): %s", i, url, result)
+                failed_urls.append(url)
                 # Continue with other URLs even if one fails
                 continue
+            if result:
+                results.append(result)
+                logger.info("Successfully scraped URL %s: %s", i, result['title'])
+        
+        if failed_urls and not results:
+            raise Exception(f"Failed to scrape all URLs: {', '.join(failed_urls)}")
         
-        logger.info(f"Successfully scraped {len(results)} out of {len(urls_to_process)} URLs")
+        logger.info("Successfully scraped %d out of %d URLs", len(results), len(urls_to_process))
         return results
     
     def _extract_title(self, soup: BeautifulSoup) -> str:
@@ -260,4 +340,9 @@ class WebScraperService:
                     title = re.sub(r'\s+', ' ', title)
                     return title[:100] + '...' if len(title) > 100 else title
         
-        return "Untitled"
\ No newline at end of file
+        return "Untitled"
+
+@lru_cache(maxsize=1)
+def get_web_scraper() -> WebScraperService:
+    """Process-wide WebScraperService instance, created on first use"""
+    return WebScraperService()
@@ -0,0 +1,128 @@
+import asyncio
+import hashlib
+import math
+import threading
+from collections import deque
+from operator import mul
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Sequence, Tuple, Union
+import orjson
+from cachetools import TTLCache
+
+_MISSING = object()
+
+def content_hash(data: Union[str, bytes]) -> str:
+    """Fast content-addressed key for large payloads"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+class AsyncTTLCache:
+    """LRU + TTL cache that coalesces concurrent misses for the same key"""
+
+    def __init__(self, maxsize: int = 512, ttl: float = 3600):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+
+    async def get_or_set(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Return cached value for key, computing it once via factory on a miss"""
+        value = self._cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        # Only one coroutine computes a given key, the rest wait for its result
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                value = self._cache.get(key, _MISSING)
+                if value is _MISSING:
+                    value = await factory()
+                    self._cache[key] = value
+                return value
+        finally:
+            if not lock.locked():
+                self._locks.pop(key, None)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key without computing it"""
+        return self._cache.get(key, default)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value for key, replacing any cached one"""
+        self._cache[key] = value
+
+    def clear(self) -> None:
+        """Drop all cached entries"""
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+class ResponseCache:
+    """Thread-safe TTL cache of raw LLM response text, keyed on the request payload"""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 3600):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(request: Dict[str, Any]) -> str:
+        """Cache key for a request payload (model, messages and sampling parameters)"""
+        return content_hash(orjson.dumps(request, option=orjson.OPT_SORT_KEYS))
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key: str, content: str) -> None:
+        if content:
+            with self._lock:
+                self._cache[key] = content
+
+    def clear(self) -> None:
+        """Drop all cached responses"""
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+class SemanticCache:
+    """Thread-safe nearest-neighbour cache over embedding vectors
+    
+    Vectors are L2-normalized on insert, so cosine similarity is a plain dot product.
+    The oldest entry is evicted once maxsize is reached.
+    """
+
+    def __init__(self, maxsize: int = 256, threshold: float = 0.92):
+        self.threshold = threshold
+        self._entries: Deque[Tuple[List[float], Any]] = deque(maxlen=maxsize)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> List[float]:
+        norm = math.sqrt(sum(map(mul, vector, vector))) or 1.0
+        return [x / norm for x in vector]
+
+    def lookup(self, vector: Sequence[float]) -> Optional[Any]:
+        """Return the value of the most similar entry above threshold, if any"""
+        query = self._normalize(vector)
+        with self._lock:
+            entries = list(self._entries)
+        best_score, best_value = self.threshold, None
+        for stored, value in entries:
+            score = sum(map(mul, stored, query))
+            if score > best_score:
+                best_score, best_value = score, value
+        return best_value
+
+    def add(self, vector: Sequence[float], value: Any) -> None:
+        with self._lock:
+            self._entries.append((self._normalize(vector), value))
+
+    def clear(self) -> None:
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,25 +1,101 @@
 import re
-from typing import List, Optional
+import json
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor
+from datetime import date
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Iterable, Optional, Tuple
+from config.settings import settings
 
-def parse_seo_keywords(keywords_string: Optional[str]) -> List[str]:
-    """Parse comma-separated SEO keywords string into list"""
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=1024)
+def parse_seo_keywords(keywords_string: Optional[str]) -> Tuple[str, ...]:
+    """Parse comma-separated SEO keywords string into a tuple
+    
+    Memoized, so the result is immutable; copy it before mutating.
+    """
     if not keywords_string:
-        return []
+        return ()
+    
+    keywords = (kw.strip() for kw in keywords_string.split(','))
+    return tuple(kw for kw in keywords if kw)
+
+@lru_cache(maxsize=1)
+def _format_day(day: date) -> str:
+    return day.strftime("%B %d, %Y")
+
+def current_date_text() -> str:
+    """Today's date as written in prompts ("January 05, 2025"), formatted once per day"""
+    return _format_day(date.today())
+
+# Used when no tokenizer is available, and to bound how much text gets tokenized
+_CHARS_PER_TOKEN = 4
+_MAX_CHARS_PER_TOKEN = 8
+
+@lru_cache(maxsize=1)
+def get_token_encoding():
+    """Tokenizer for the configured OpenAI model, or None if tiktoken can't provide one"""
+    if tiktoken is None:
+        return None
+    
+    # Fine-tuned models ("ft:<base>:<org>:...") tokenize like their base model
+    model = settings.OPENAI_MODEL
+    if model.startswith("ft:"):
+        model = model.split(":")[1]
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # Encodings are downloaded on first use; offline hosts fall back to character budgets
+        logger.warning("Token encoding unavailable, truncating by characters: %s", e)
+        return None
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to at most max_tokens tokens of the configured model
+    
+    Only the head of the text is tokenized, so the cost is bounded by max_tokens
+    regardless of how long the scraped page or PDF is.
+    """
+    encoding = get_token_encoding()
+    if encoding is None:
+        return text[:max_tokens * _CHARS_PER_TOKEN]
     
-    keywords = [kw.strip() for kw in keywords_string.split(',')]
-    return [kw for kw in keywords if kw]
+    # Every token spans at least one character, so short text is already within budget
+    if len(text) <= max_tokens:
+        return text
+    head = text[:max_tokens * _MAX_CHARS_PER_TOKEN]
+    tokens = encoding.encode(head, disallowed_special=())
+    return head if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+
+def count_tokens(text: str) -> int:
+    """Number of tokens text takes for the configured model (estimated without a tokenizer)"""
+    encoding = get_token_encoding()
+    if encoding is None:
+        return len(text) // _CHARS_PER_TOKEN
+    return len(encoding.encode(text, disallowed_special=()))
+
+# Compiled once at import instead of on every validate_url call
+_URL_PATTERN = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
 
 def validate_url(url: str) -> bool:
     """Validate URL format"""
-    url_pattern = re.compile(
-        r'^https?://'  # http:// or https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-        r'localhost|'  # localhost...
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-    
-    return url_pattern.match(url) is not None
+    return _URL_PATTERN.match(url) is not None
 
 def clean_html_content(html_content: str) -> str:
     """Clean HTML content for processing"""
@@ -45,4 +121,88 @@ def truncate_text(text: str, max_length: int = 5000) -> str:
     if last_period > max_length * 0.8:  # If we can keep at least 80% of content
         return truncated[:last_period + 1]
     
-    return truncated + '...'
\ No newline at end of file
+    return truncated + '...'
+
+# Escape sequence for the first half of a UTF-16 surrogate pair
+_HIGH_SURROGATE_ESCAPE = re.compile(r'\\u[dD][89abAB][0-9a-fA-F]{2}$')
+
+class JsonStringFieldReader:
+    """Incrementally decode one string field from JSON text that arrives in chunks
+    
+    feed() returns the newly decoded part of the field's value, so a streamed
+    article can be shown as Markdown before the whole JSON object has arrived.
+    """
+    
+    def __init__(self, field: str):
+        self._key = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._buffer = ""
+        self._started = False
+        self._done = False
+    
+    def feed(self, chunk: str) -> str:
+        if self._done:
+            return ""
+        self._buffer += chunk
+        if not self._started:
+            match = self._key.search(self._buffer)
+            if match is None:
+                return ""
+            self._started = True
+            self._buffer = self._buffer[match.end():]
+        
+        # Decode up to the closing quote, holding back an escape cut off by the chunk boundary
+        buffer = self._buffer
+        i, n = 0, len(buffer)
+        while i < n:
+            c = buffer[i]
+            if c == '\\':
+                width = 6 if i + 1 < n and buffer[i + 1] == 'u' else 2
+                if i + width > n:
+                    break
+                i += width
+            elif c == '"':
+                self._done = True
+                break
+            else:
+                i += 1
+        
+        if not self._done and _HIGH_SURROGATE_ESCAPE.search(buffer, 0, i):
+            i -= 6  # wait for the low surrogate
+        segment, self._buffer = buffer[:i], buffer[i:]
+        return json.loads('"' + segment + '"') if segment else ""
+
+async def iterate_in_thread(func: Callable[..., Iterable[Any]], *args: Any,
+                            executor: Optional[Executor] = None) -> AsyncIterator[Any]:
+    """Consume a blocking iterator in a worker thread, yielding items as they arrive
+    
+    The thread comes from the given executor, or the loop's default one.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stopped = threading.Event()
+    end = object()
+
+    def produce():
+        try:
+            for item in func(*args):
+                if stopped.is_set():
+                    return
+                loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, (end, e))
+        else:
+            loop.call_soon_threadsafe(queue.put_nowait, (end, None))
+
+    producer = loop.run_in_executor(executor, produce)
+    try:
+        while True:
+            item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is end:
+                break
+            yield item
+    finally:
+        # Let the worker thread exit early if the consumer goes away
+        stopped.set()
+    await producer
@@ -0,0 +1,31 @@
+import threading
+import time
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at rate units per period
+    
+    acquire() blocks the calling thread until enough units are available, so it
+    paces callers running on worker threads rather than rejecting them.
+    """
+
+    def __init__(self, rate: float, period: float = 60.0):
+        self.capacity = rate
+        self._refill_per_second = rate / period
+        self._available = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1) -> None:
+        """Take amount units, waiting for the bucket to refill if needed"""
+        # A request larger than the bucket would never fit; let it drain the bucket instead
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._available = min(self.capacity, self._available + (now - self._updated) * self._refill_per_second)
+                self._updated = now
+                if self._available >= amount:
+                    self._available -= amount
+                    return
+                wait = (amount - self._available) / self._refill_per_second
+            time.sleep(wait)
@@ -19,6 +19,7 @@ export default function HomePage() {
   });
   const [currentView, setCurrentView] = useState<'input' | 'result'>('input');
   const [abortController, setAbortController] = useState<AbortController | null>(null);
+  const [regenerate, setRegenerate] = useState(false);
 
   const handleGenerateArticle = async (request: ArticleRequest) => {
     // Create abort controller for cancellation
@@ -67,7 +68,7 @@ export default function HomePage() {
         progress: 95 
       }));
 
-      const response = await articleAPI.generateArticle(request, controller.signal);
+      const response = await articleAPI.generateArticle({ ...request, regenerate }, controller.signal);
       
       if (controller.signal.aborted) {
         return;
@@ -90,6 +91,7 @@ export default function HomePage() {
       }
       
       setCurrentView('result');
+      setRegenerate(false);
       setGenerationStatus({
         isGenerating: false,
         currentStep: 'Complete',
@@ -133,6 +135,7 @@ export default function HomePage() {
 
   const handleBackToInput = () => {
     setCurrentView('input');
+    setRegenerate(false);
     setArticle(null);
     setRawGeminiResponse(null);
     setGenerationStatus({
@@ -144,6 +147,8 @@ export default function HomePage() {
 
   const handleRegenerateRequest = () => {
     setCurrentView('input');
+    // The next submission must not be served the same article from the server cache
+    setRegenerate(true);
     setArticle(null);
     setRawGeminiResponse(null);
     setGenerationStatus({
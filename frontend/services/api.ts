@@ -33,6 +33,7 @@ export const articleAPI = {
         custom_prompt: request.customPrompt,
         include_thai_translation: request.includeThaiTranslation,
         selected_model: request.selectedModel,
+        regenerate: request.regenerate,
       }, {
         signal
       });
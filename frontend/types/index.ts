@@ -18,6 +18,7 @@ export interface ArticleRequest {
   customPrompt?: string;  // Custom user instructions
   includeThaiTranslation?: boolean;  // Whether to generate Thai translation
   selectedModel?: 'gpt-finetune' | 'gemini-pro';  // Model selection
+  regenerate?: boolean;  // Skip cached results and generate a fresh article
 }
 
 export interface ImageSlot {